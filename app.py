@@ -1,1284 +1,19 @@
 import os
-import re
 import dash
 from dash import dcc
 from dash import html
-from datetime import datetime
 from dash import dash_table
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 import dash_bootstrap_components as dbc
-import numpy as np
-from dash import Input, Output
-from plotly.subplots import make_subplots
+from dash import Input, Output, State
+from reorg_snapshot import live_snapshot, snapshot_figures
+from reorg_metrics import init_metrics
+from reorg_http import init_http_caching
+from reorg_table import page_count, table_page
 
-clclientorder = ["Lighthouse", "Prysm", "Nimbus", "Teku", "Lodestar"]
-
-
-def exclude_clients_not_shown(df):
-    _clients = df["cl_client"].unique()
-    _clclientorder = clclientorder
-    for i in clclientorder:
-        if i not in _clients:
-            _clclientorder.remove(i)
-    return _clclientorder
-
-def orderclclient(df):
-    _clientorder = exclude_clients_not_shown(df)
-    df.set_index("cl_client", inplace=True)
-    df = df.loc[_clientorder]
-    return df.reset_index()
-
-
-# Data preparation
-def prepare_data():
-    df = pd.read_csv("reorg-data.csv").replace("Unknown", "Unknown/missed")
-    #df = df[~df['cl_client'].str.contains('Unknown')]
-    df2 = pd.read_csv("validator_slots.csv").replace("Unknown", "Unknown/missed")
-    #df2 = df2[~df2['validator'].str.contains('Unknown')]
-    df3 = pd.read_csv("relay_slots.csv").replace("Unknown", "Unknown/missed")
-    #df3 = df3[~df3['relay'].str.contains('Unknown')]
-    df4 = pd.read_csv("builder_slots.csv").replace("Unknown", "Unknown/missed")
-    #df4 = df4[~df4['builder'].str.contains('Unknown')]
-    df5 = pd.read_csv("clclient_slots.csv").replace("Unknown", "Unknown/missed")
-    #df5 = df5[~df5['cl_client'].str.contains('Unknown')]
-    
-    def clean_data(text):
-        if isinstance(text, str):
-            return re.sub(r'[^\x20-\x7E]', '', text)
-        return text
-    
-    df['builder'] = df['builder'].apply(clean_data)
-    df4['builder'] = df4['builder'].apply(clean_data)
-
-    
-    def max_slot(slot):
-        return int(slot.split("[")[1].split("]")[0])
-    
-    dfreorger = pd.read_csv("reorgers-data.csv")
-    dfreorger['builder'] = dfreorger['builder'].apply(clean_data)
-    
-    dfreorger = dfreorger[dfreorger["slot"].apply(max_slot) > max(dfreorger["slot"].apply(max_slot)) - 7200*60]
-    
-    df_30 = df[df["slot"].apply(max_slot) > max(df["slot"].apply(max_slot)) - 7200*30]
-    df_table = df_30.rename(columns={"slot": "Slot", "parent_slot": "Parent Slot", "cl_client": "CL Client", "validator_id": "Val. ID", "date": "Date", "slot_in_epoch": "Slot Nr. in Epoch"})
-    df_table.sort_values("Date", ascending=False, inplace=True)
-    df_table = df_table[["Slot", "Parent Slot", "CL Client", "Val. ID", "Date", "Slot Nr. in Epoch"]].drop_duplicates()
-    #df_table["Val. ID"] = df_table["Val. ID"]#.replace(0, np.NaN)
-    df_table["Slot Nr. in Epoch"] = df_table["Slot Nr. in Epoch"].astype(int)
-    df_table["Val. ID"] = df_table["Val. ID"].astype(int)
-    df_table["Parent Slot"] = df_table["Parent Slot"].astype(str)
-    
-    #df_table['slot_sort'] = df_table['Slot'].apply(lambda x: int(x.split("[")[1].split("]")[0]))  # Update the split function as needed
-
-    
-    #df = df[~df['cl_client'].str.contains('Unknown')]
-    
-    df_90 = df[df["slot"].apply(max_slot) > max(df["slot"].apply(max_slot)) - 7200*90].drop("parent_slot", axis=1)
-    df_60 = df[df["slot"].apply(max_slot) > max(df["slot"].apply(max_slot)) - 7200*60].drop("parent_slot", axis=1)
-    df_30 = df[df["slot"].apply(max_slot) > max(df["slot"].apply(max_slot)) - 7200*30].drop("parent_slot", axis=1)
-    df_14 = df[df["slot"].apply(max_slot) > max(df["slot"].apply(max_slot)) - 7200*14].drop("parent_slot", axis=1)
-    df_7 = df[df["slot"].apply(max_slot) > max(df["slot"].apply(max_slot)) - 7200*7].drop("parent_slot", axis=1)
-    
-    
-    
-    
-    df_per_sie_60 = df_60.groupby(["cl_client", "slot_in_epoch"])['slot'].count().reset_index().sort_values("slot_in_epoch")
-    #df_per_sie_60.set_index('slot_in_epoch', inplace=True)
-    #print(df_per_sie_60)
-    #df_per_sie_60 = df_per_sie_60.reindex(range(0, 32))
-    #df_per_sie_60.fillna(0, inplace=True)
-    #df_per_sie_60.reset_index(inplace=True)
-    #df_per_sie_60.rename(columns={'index': 'slot_in_epoch'}, inplace=True)
-    
-    df_per_sie_30 = df_30.groupby(["cl_client", "slot_in_epoch"])['slot'].count().reset_index().sort_values("slot_in_epoch")
-    #df_per_sie_30.set_index('slot_in_epoch', inplace=True)
-    #df_per_sie_30 = df_per_sie_30.reindex(range(0, 32))
-    #df_per_sie_30.fillna(0, inplace=True)
-    #df_per_sie_30.reset_index(inplace=True)
-    #df_per_sie_30.rename(columns={'index': 'slot_in_epoch'}, inplace=True)
-    
-    df_per_sie_14 = df_14.groupby(["cl_client", "slot_in_epoch"])['slot'].count().reset_index().sort_values("slot_in_epoch")
-    #df_per_sie_14.set_index('slot_in_epoch', inplace=True)
-    #df_per_sie_14 = df_per_sie_14.reindex(range(0, 32))
-    #df_per_sie_14.fillna(0, inplace=True)
-    #df_per_sie_14.reset_index(inplace=True)
-    #df_per_sie_14.rename(columns={'index': 'slot_in_epoch'}, inplace=True)
-    
-    df_per_sie_7 = df_7.groupby(["cl_client", "slot_in_epoch"])['slot'].count().reset_index().sort_values("slot_in_epoch")
-    #df_per_sie_7.set_index('slot_in_epoch', inplace=True)
-    #df_per_sie_7 = df_per_sie_7.reindex(range(0, 32))
-    #df_per_sie_7.fillna(0, inplace=True)
-    #df_per_sie_7.reset_index(inplace=True)
-    #df_per_sie_7.rename(columns={'index': 'slot_in_epoch'}, inplace=True)
-
-    return df_90, df_60, df_30, df_14, df_7, df_table, df_per_sie_60, df_per_sie_30, df_per_sie_14, df_per_sie_7, df2, df3, df4, df5, dfreorger
-
-def fig3_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 18
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Reorged Slot Nr. in Epoch</span>',
-        xaxis_title='Slot',
-        margin=dict(l=20, r=20, t=40, b=20),
-        font=dict(family="Ubuntu Mono", size = font_size),
-        barmode='stack',
-        hovermode="x unified",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        legend=dict(
-            x=1,           # x position of the legend (1 corresponds to the right end of the plot)
-            y=1,           # y position of the legend (1 corresponds to the top of the plot)
-            xanchor="auto",  # x anchor of the legend
-            yanchor="auto",  # y anchor of the legend
-            bgcolor="rgba(255, 255, 255, 0.5)" # You can set a background color for readability if needed
-        ),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,
-            tickvals=list(range(32))     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        updatemenus=[dict(
-            buttons=[
-                dict(args=[{"visible": [True if i %4==0 else False for i in range(20)]},
-                           {}],
-                    label="60 days",
-                    method="update"
-                )
-                ,
-                dict(args=[{"visible": [True if i %4==1 else False for i in range(20)]},
-                               {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Slot Nr. Reorged in Epoch</span>',}],
-                        label="30 days",
-                        method="update"
-                ),
-                dict(args=[{"visible": [True if i %4==2 else False for i in range(20)]},
-                           {}],
-                    label="14 days",
-                    method="update"
-                )
-                ,
-                dict(args=[{"visible": [True if i %4==3 else False for i in range(20)]},
-                               {}],
-                        label="7 days",
-                        method="update"
-                )
-                ],
-            showactive= True,
-            direction= 'down',
-            active= 0,
-            x= 1.0, 
-            xanchor= 'right', 
-            y= 1.15, 
-            yanchor= 'top'
-        )]
-    )
-
-def create_fig3(df_per_sie_60, df, df_per_sie_14, df_per_sie_7):
-    fig = make_subplots(rows=1, cols=1)
-    df_per_sie_60 = df_per_sie_60[~df_per_sie_60['cl_client'].str.contains('missed')]
-    df = df[~df['cl_client'].str.contains('missed')]
-    df_per_sie_14 = df_per_sie_14[~df_per_sie_14['cl_client'].str.contains('missed')]
-    df_per_sie_7 = df_per_sie_7[~df_per_sie_7['cl_client'].str.contains('missed')]
-    
-    #df_per_sie_60 = orderclclient(df_per_sie_60)
-    #df_per_sie_14 = orderclclient(df_per_sie_14)
-    #df_per_sie_7 = orderclclient(df_per_sie_7)
-    
-
-    # Colors array (can be extended with more colors)
-    colors = [
-        '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
-        '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
-    ]
-
-    # Add traces for each client
-    for i, client in enumerate(clclientorder):
-        visible = True
-        for j in (df_per_sie_60, df, df_per_sie_14, df_per_sie_7):
-            #j = orderclclient(j.reset_index())
-            k = j[j["cl_client"] == client]
-            fig.add_trace(go.Bar(x=k["slot_in_epoch"], y=k["slot"], name=client, marker_color=colors[i], visible=visible,hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>'))
-            visible = False
-        
-
-
-    fig.update_layout(**fig3_layout())
-    fig.update_yaxes(title_standoff=5)
-    return fig
-
-def fig2_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 18
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per CL Client<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-        xaxis_title='%',
-        yaxis_title='Client',
-        hovermode = "closest",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        margin=dict(l=20, r=20, t=80, b=20),
-        font=dict(family="Ubuntu Mono", size = font_size),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        updatemenus=[dict(
-            type="buttons",
-            buttons=[
-                dict(args=[{"visible": [True]*5+5*[False]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Client<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            # "height":500,
-                            "xaxis.title": "%",
-                            #"annotations": k
-                           }],
-                    label="Relative",
-                    method="update"
-                )
-                ,
-                dict(args=[{"visible": [False]*5+5*[True]},
-                               {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absulute Nr. of Reorged Slots per Client<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                                # "height":500,
-                                "xaxis.title": "slots",
-                                #"annotations": k
-                               }],
-                        label="Absolute",
-                        method="update"
-                )
-                ],
-            showactive= True,
-            direction= 'left',
-            active= 0,
-            x= 1.0, 
-            xanchor= 'right', 
-            y= 1.15, 
-            yanchor= 'top'
-        )]   
-    )
-
-
-def create_fig2(df_90, df, df_30, df_14, df_7, order):
-    df = df.drop("relay", axis=1).drop_duplicates()
-    df = df[~df['cl_client'].str.contains('missed')]
-    _df = df['cl_client'].value_counts().reset_index()
-    _df.columns = ["cl_client", "count"]
- 
-    _df = pd.merge(_df,order,how="left", left_on="cl_client", right_on="cl_client")
-    _df["cl_client"]= _df["cl_client"].apply(lambda x: x[0].upper()+x[1:])
-    _df.columns = ['cl_client', 'count', 'slots']
-    _df["relative_count"] = round(_df['count'] / _df['slots'] * 100, 5)
-    _df.sort_values("relative_count", ascending=False, inplace=True)
-    fig2 = make_subplots(rows=1, cols=1)
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-    _df = orderclclient(_df)
-    for index, row in _df.iterrows():
-        client = row['cl_client']
-        relative_count = row['relative_count']
-        color = colors[index % len(colors)]
-
-        fig2.add_trace(
-            go.Bar(
-                x=[relative_count], 
-                y=[client], 
-                orientation='h', 
-                marker=dict(color=color),
-                hovertemplate=f'<b>{client}: {relative_count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-
-    # Create the absolute bars
-    for index, row in _df.iterrows():
-        client = row['cl_client']
-        count = row['count']
-        color = colors[index % len(colors)]
-
-        fig2.add_trace(
-            go.Bar(
-                x=[count], 
-                y=[client], 
-                orientation='h', 
-                marker=dict(color=color), 
-                visible=False,
-                hovertemplate=f'<b>{client}: {count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    fig2.update_layout(**fig2_layout())
-    fig2.update_yaxes(title_standoff=5)
-    return fig2
-
-def fig1_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 20
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Number of Reorged Blocks Over Time</span>',
-        xaxis_title='Date',
-        yaxis_title='#Blocks',
-        margin=dict(l=20, r=20, t=40, b=20),
-        font=dict(family="Ubuntu Mono", size = font_size),
-        hovermode = "x unified",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        legend=dict(
-            x=0,           # x position of the legend (1 corresponds to the right end of the plot)
-            y=1,           # y position of the legend (1 corresponds to the top of the plot)
-            xanchor="auto",  # x anchor of the legend
-            yanchor="auto",  # y anchor of the legend
-            bgcolor="rgba(255, 255, 255, 0.7)" # You can set a background color for readability if needed
-        ),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        updatemenus=[dict(
-            type="buttons",
-            buttons=[
-                dict(args=[{"visible": [True if i%2==0 else False for i in range(10)]},
-                           {}],
-                    label="Absolute",
-                    method="update"
-                )
-                ,
-                dict(args=[{"visible": [True if i%2==1 else False for i in range(10)]},
-                               {}],
-                        label="Relative",
-                        method="update"
-                )
-                ],
-            showactive= True,
-            direction= 'left',
-            active= 0,
-            x= 1.0, 
-            xanchor= 'right', 
-            y= 1.15, 
-            yanchor= 'top'
-        )]
-    )
-
-def create_fig1(df_90, df_60, df, df_14, df_7):
-    df = df.drop("relay", axis=1).drop_duplicates()
-    df = df[df["cl_client"] != "missed"]
-    fig1 = make_subplots(rows=1, cols=1)
-    df.loc[:,"date"] = df["date"].apply(lambda x: x.split(" ")[0])
-    grouped_data = df.groupby(["date","cl_client"])["slot"].count().reset_index()
-    ordering = grouped_data.groupby("cl_client")["slot"].count().index.sort_values().values.tolist()
-    grouped_data.set_index("cl_client", inplace=True)
-    grouped_data = grouped_data.loc[ordering].reset_index()
-    for i, j in grouped_data.iterrows():
-        grouped_data.loc[i, "relative_count"] = float(j["slot"] / grouped_data[grouped_data["date"] == j["date"]]["slot"].sum())
- 
-        
-        
-    #grouped_data["relative_count"] = grouped_data["slot"]/grouped_data["sum"]
-
-    colors = [
-        '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
-        '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
-    ]
-    color_mapping = {client: color for client, color in zip(clclientorder, colors)}
-
-    grouped_data = orderclclient(grouped_data)
-    for client in grouped_data['cl_client'].unique():
-        client_data = grouped_data[grouped_data['cl_client'] == client]
-        visibility = "legendonly" if "missed" in client else True
-        
-        fig1.add_trace(
-            go.Scatter(x=client_data['date'], y=client_data['slot'], mode='lines', name=client, stackgroup='A', visible=visibility, hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>', line=dict(color=color_mapping[client]))
-        )
-        fig1.add_trace(
-            go.Scatter(x=client_data['date'], y=client_data['relative_count'], mode='lines', name=client, stackgroup='B', visible=False, hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>', line=dict(color=color_mapping[client]))
-        )
-        
-
-    fig1.update_layout(**fig1_layout())
-    fig1.update_yaxes(title_standoff=5)
-    return fig1
-
-def fig4_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 20
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-        xaxis_title='%',
-        yaxis_title='Validator',
-        margin=dict(l=20, r=20, t=80, b=20),
-        font=dict(family="Ubuntu Mono", size=font_size),
-        hovermode = "closest",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        updatemenus=[dict(
-            type="buttons",
-            buttons=[
-                dict(args=[{"visible": [True]*12+12*[False]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "%",
-                           }],
-                    label="Relative",
-                    method="update"
-                ),
-                dict(args=[{"visible":  [False]*12+12*[True]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "slots",
-                           }],
-                    label="Absolute",
-                    method="update"
-                )
-            ],
-            showactive=True,
-            direction='left',
-            active=0,
-            x=1.0,
-            xanchor='right',
-            y=1.15,
-            yanchor='top'
-        )]
-    )
-
-
-def create_fig_for_validators(df_90, df, df_30, df_14, df_7, order):
-    df = df.drop("relay", axis=1).drop_duplicates()
-    df = df[df["validator"] != "missed"]
-    _df = df['validator'].value_counts().reset_index()
-    _df.columns = ["validator", "count"]
-    _df = pd.merge(_df,order,how="left", left_on="validator", right_on="validator")
-    _df["validator"]= _df["validator"].apply(lambda x: x[0].upper()+x[1:])
-    _df.columns = ['validator', 'count', 'slots']
-    _df["relative_count"] = round(_df['count'] / _df['slots'] * 100, 5)
-    _df = _df[_df["count"] > 0]
-    _df["validator"] = _df["validator"].apply(lambda x: x[0:9]+"..." if x.startswith("0x") else x)
-    _df.sort_values("relative_count", ascending=False, inplace=True)
-    _df = _df.iloc[0:12]
-    fig = make_subplots(rows=1, cols=1)
-    colors= ['#1f77b4','#ff7f0e','#2ca02c','#d62728','#9467bd','#8c564b','#e377c2','#7f7f7f','#bcbd22','#17becf']
-    for index, row in _df.iterrows():
-        validator = row['validator']
-        relative_count = row['relative_count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[relative_count], 
-                y=[validator], 
-                orientation='h', 
-                marker=dict(color=color),
-                hovertemplate=f'<b>{validator}: {relative_count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-
-    # Create the absolute bars
-    for index, row in _df.iterrows():
-        validator = row['validator']
-        count = row['count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[count], 
-                y=[validator], 
-                orientation='h', 
-                marker=dict(color=color), 
-                visible=False,
-                hovertemplate=f'<b>{validator}: {count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    fig.update_layout(**fig4_layout())
-    fig.update_yaxes(title_standoff=5)
-    return fig
-
-def fig5_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 20
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-        xaxis_title='%',
-        yaxis_title='Relay',
-        margin=dict(l=20, r=20, t=80, b=20),
-        font=dict(family="Ubuntu Mono", size=font_size),
-        hovermode = "closest",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        updatemenus=[dict(
-            type="buttons",
-            buttons=[
-                dict(args=[{"visible": [True]*10+10*[False]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "%",
-                           }],
-                    label="Relative",
-                    method="update"
-                ),
-                dict(args=[{"visible": [False]*10+10*[True]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "slots",
-                           }],
-                    label="Absolute",
-                    method="update"
-                )
-            ],
-            showactive=True,
-            direction='left',
-            active=0,
-            x=1.0,
-            xanchor='right',
-            y=1.15,
-            yanchor='top'
-        )]
-    )
-
-def create_fig_for_relays(df_90, df, df_30, df_14, df_7, order):
-    df = df[df["relay"] != "missed"]
-    _df = df['relay'].value_counts().reset_index()
-    _df.columns = ["relay", "count"]
-    
-    _df = pd.merge(_df,order,how="left", left_on="relay", right_on="relay")
-    _df["relay"]= _df["relay"].apply(lambda x: x[0].upper()+x[1:])
-    order["relay"]= order["relay"].apply(lambda x: x[0].upper()+x[1:])
-    _df.columns = ['relay', 'count', 'slots']
-    _df["relative_count"] = round(_df['count'] / _df['slots'] * 100, 5)
-    _df = _df[_df["count"] > 0]
-    _df["relay"] = _df["relay"].apply(lambda x: x[0:9]+"..." if x.startswith("0x") else x)
-    _df["relay"]= _df["relay"].apply(lambda x: x[0].upper()+x[1:])
-    _df.sort_values("relative_count", ascending=False, inplace=True)
-    _df = _df.iloc[0:11]
-    fig = make_subplots(rows=1, cols=1)
-    colors= ['#1f77b4','#ff7f0e','#2ca02c','#d62728','#9467bd','#8c564b','#e377c2','#7f7f7f','#bcbd22','#17becf']
-    for index, row in _df.iterrows():
-        relay = row['relay']
-        relative_count = row['relative_count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[relative_count], 
-                y=[relay], 
-                orientation='h', 
-                marker=dict(color=color),
-                hovertemplate=f'<b>{relay}: {relative_count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    for i in order["relay"]:
-        if i not in _df['relay'].values.tolist():
-            fig.add_trace(go.Bar())
-
-    # Create the absolute bars
-    for index, row in _df.iterrows():
-        relay = row['relay']
-        count = row['count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[count], 
-                y=[relay], 
-                orientation='h', 
-                marker=dict(color=color), 
-                visible=False,
-                hovertemplate=f'<b>{relay}: {count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    for i in order["relay"]:
-        if i not in _df['relay'].values.tolist():
-            fig.add_trace(go.Bar())
-    fig.update_layout(**fig5_layout())
-    fig.update_yaxes(title_standoff=5)
-    return fig
-
-
-
-
-
-
-def create_reorger_builder_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 20
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-        xaxis_title='%',
-        yaxis_title='Builder',
-        margin=dict(l=20, r=20, t=80, b=20),
-        font=dict(family="Ubuntu Mono", size=font_size),
-        hovermode = "closest",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        paper_bgcolor= "#eee",
-        updatemenus=[dict(
-            type="buttons",
-            buttons=[
-                dict(args=[{"visible": [True]*12+12*[False]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "%",
-                           }],
-                    label="Relative",
-                    method="update"
-                ),
-                dict(args=[{"visible":[False]*12+12*[True]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Slots by Reorging Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "slots",
-                           }],
-                    label="Absolute",
-                    method="update"
-                )
-            ],
-            showactive=True,
-            direction='left',
-            active=0,
-            x=1.0,
-            xanchor='right',
-            y=1.15,
-            yanchor='top'
-        )]
-    )
-
-def create_reorger_builder(df_90, df_60, df_30, df_14, df_7, order, df):
-    df = df.drop("relay", axis=1).drop_duplicates()
-    df = df[df["builder"] != "missed"]
-    _df = df['builder'].value_counts().reset_index()
-    _df.columns = ["builder", "count"]
-    _df["builder"]= _df["builder"].apply(lambda x: x[0].upper()+x[1:])
-    order["builder"]= order["builder"].apply(lambda x: x[0].upper()+x[1:])
-    _df = pd.merge(_df,order,how="left", left_on="builder", right_on="builder")
-    _df.columns = ['builder', 'count', 'slots']
-    _df["relative_count"] = round(_df['count'] / _df['slots'] * 100, 5)
-    _df = _df[_df["count"] > 0]
-    _df["builder"] = _df["builder"].apply(lambda x: x[0:9]+"..." if x.startswith("0x") else x)
-    _df["builder"]= _df["builder"].apply(lambda x: x[0].upper()+x[1:])
-    _df.sort_values("relative_count", ascending=False, inplace=True)    
-    _df = _df.iloc[0:12]
-    fig = make_subplots(rows=1, cols=1)
-    colors= ['#1f77b4','#ff7f0e','#2ca02c','#d62728','#9467bd','#8c564b','#e377c2','#7f7f7f','#bcbd22','#17becf']
-    for index, row in _df.iterrows():
-        builder = row['builder']
-        relative_count = row['relative_count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[relative_count], 
-                y=[builder], 
-                orientation='h', 
-                marker=dict(color=color),
-                hovertemplate=f'<b>{builder}: {relative_count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    for i in order["builder"]:
-        if i not in _df['builder'].values.tolist():
-            fig.add_trace(go.Bar())
-
-    # Create the absolute bars
-    for index, row in _df.iterrows():
-        builder = row['builder']
-        count = row['count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[count], 
-                y=[builder], 
-                orientation='h', 
-                marker=dict(color=color), 
-                visible=False,
-                hovertemplate=f'<b>{builder}: {count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    for i in order["builder"]:
-        if i not in _df['builder'].values.tolist():
-            fig.add_trace(go.Bar())
-    fig.update_layout(**create_reorger_builder_layout())
-    fig.update_yaxes(title_standoff=5)
-    return fig
-
-
-
-
-
-
-def create_reorger_validator_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 20
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-        xaxis_title='%',
-        yaxis_title='Validator',
-        margin=dict(l=20, r=20, t=80, b=20),
-        font=dict(family="Ubuntu Mono", size=font_size),
-        hovermode = "closest",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        paper_bgcolor= "#eee",
-        updatemenus=[dict(
-            type = "buttons",
-            direction = "left",
-
-            buttons=[
-                dict(args=[{"visible": [True]*12+12*[False]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "%",
-                           }],
-                    label="Relative",
-                    method="update"
-                ),
-                dict(args=[{"visible": [False]*12+12*[True]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Slots by Reorging Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "slots",
-                           }],
-                    label="Absolute",
-                    method="update"
-                )
-            ],
-            showactive=True,
-            active=0,
-            x=1.0,
-            xanchor='right',
-            y=1.15,
-            yanchor='top'
-        )]
-    )
-
-def create_reorger_validator(df_90, df_60, df_30, df_14, df_7, order, df):
-    df = df.drop("relay", axis=1).drop_duplicates()
-    df = df[df["validator"] != "missed"]
-    _df = df['validator'].value_counts().reset_index()
-    _df.columns = ["validator", "count"]
-    _df = pd.merge(_df,order,how="left", left_on="validator", right_on="validator")
-    _df["validator"]= _df["validator"].apply(lambda x: x[0].upper()+x[1:])
-    _df.columns = ['validator', 'count', 'slots']
-    _df["relative_count"] = round(_df['count'] / _df['slots'] * 100, 5)
-    _df = _df[_df["count"] > 0]
-    _df["validator"] = _df["validator"].apply(lambda x: x[0:9]+"..." if x.startswith("0x") else x)
-    _df["validator"]= _df["validator"].apply(lambda x: x[0].upper()+x[1:])
-    _df.sort_values("relative_count", ascending=False, inplace=True)    
-    _df = _df.iloc[0:12]
-    fig = make_subplots(rows=1, cols=1)
-    colors= ['#1f77b4','#ff7f0e','#2ca02c','#d62728','#9467bd','#8c564b','#e377c2','#7f7f7f','#bcbd22','#17becf']
-    for index, row in _df.iterrows():
-        validator = row['validator']
-        relative_count = row['relative_count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[relative_count], 
-                y=[validator], 
-                orientation='h', 
-                marker=dict(color=color),
-                hovertemplate=f'<b>{validator}: {relative_count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-
-    # Create the absolute bars
-    for index, row in _df.iterrows():
-        validator = row['validator']
-        count = row['count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[count], 
-                y=[validator], 
-                orientation='h', 
-                marker=dict(color=color), 
-                visible=False,
-                hovertemplate=f'<b>{validator}: {count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    
-    fig.update_layout(**create_reorger_validator_layout())
-    fig.update_yaxes(title_standoff=5)
-    return fig
-
-
-
-
-
-
-def create_reorger_relay_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 20
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-        xaxis_title='%',
-        yaxis_title='Relay',
-        margin=dict(l=20, r=20, t=80, b=20),
-        font=dict(family="Ubuntu Mono", size=font_size),
-        hovermode = "closest",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        paper_bgcolor= "#eee",
-        updatemenus=[dict(
-            type="buttons",
-            buttons=[
-                dict(args=[{"visible": [True]*10+10*[False]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "%",
-                           }],
-                    label="Relative",
-                    method="update"
-                ),
-                dict(args=[{"visible": [False]*10+10*[True]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Slots by Reorging Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "slots",
-                           }],
-                    label="Absolute",
-                    method="update"
-                )
-            ],
-            showactive=True,
-            direction='left',
-            active=0,
-            x=1.0,
-            xanchor='right',
-            y=1.15,
-            yanchor='top'
-        )]
-    )
-
-def create_reorger_relay(df_90, df_60, df_30, df_14, df_7, order, df):
-    df = df[df["relay"] != "missed"]
-    _df = df['relay'].value_counts().reset_index()
-    _df.columns= ['relay', 'count']
-    _df["relay"]= _df["relay"].apply(lambda x: x[0].upper()+x[1:])
-    order["relay"]= order["relay"].apply(lambda x: x[0].upper()+x[1:])
-    _df = pd.merge(_df,order,how="left", left_on="relay", right_on="relay")
-    #_df.columns = ["relay", "count"]
-    _df.columns = ['relay', 'count', 'slots']
-    _df["relative_count"] = round(_df['count'] / _df['slots'] * 100, 5)
-    _df = _df[_df["count"] > 0]
-    _df["relay"] = _df["relay"].apply(lambda x: x[0:9]+"..." if x.startswith("0x") else x)
-    order["relay"] = order["relay"].apply(lambda x: x[0:9]+"..." if x.startswith("0x") else x)
-    _df.sort_values("relative_count", ascending=False, inplace=True)    
-    _df = _df.iloc[0:11]
-    fig = make_subplots(rows=1, cols=1)
-    colors= ['#1f77b4','#ff7f0e','#2ca02c','#d62728','#9467bd','#8c564b','#e377c2','#7f7f7f','#bcbd22','#17becf']
-    for index, row in _df.iterrows():
-        relay = row['relay']
-        relative_count = row['relative_count']
-        color = colors[index % len(colors)]
-        #print(relay, str(relative_count))
-
-        fig.add_trace(
-            go.Bar(
-                x=[relative_count], 
-                y=[relay], 
-                orientation='h', 
-                marker=dict(color=color),
-                hovertemplate=f'<b>{relay}: {relative_count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    
-    for i in order["relay"]:
-        if i not in _df['relay'].values.tolist():
-            fig.add_trace(go.Bar())
-
-
-    # Create the absolute bars
-    for index, row in _df.iterrows():
-        relay = row['relay']
-        count = row['count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[count], 
-                y=[relay], 
-                orientation='h', 
-                marker=dict(color=color), 
-                visible=False,
-                hovertemplate=f'<b>{relay}: {count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-        
-    for i in order["relay"]:
-        if i not in _df['relay'].values.tolist():
-            fig.add_trace(go.Bar())
-    fig.update_layout(**create_reorger_relay_layout())
-    fig.update_yaxes(title_standoff=5)
-    return fig
-
-
-def fig6_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 20
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-        xaxis_title='%',
-        yaxis_title='Builder',
-        margin=dict(l=20, r=20, t=80, b=20),
-        font=dict(family="Ubuntu Mono", size=font_size),
-        hovermode = "closest",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        updatemenus=[dict(
-            type="buttons",
-            buttons=[
-                dict(args=[{"visible": [True]*10+10*[False]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "%",
-                           }],
-                    label="Relative",
-                    method="update"
-                ),
-                dict(args=[{"visible": [False]*10+10*[True]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
-                            "xaxis.title": "slots",
-                           }],
-                    label="Absolute",
-                    method="update"
-                )
-            ],
-            showactive=True,
-            direction='left',
-            active=0,
-            x=1.0,
-            xanchor='right',
-            y=1.15,
-            yanchor='top'
-        )]
-    )
-
-
-def create_fig_for_builders(df_90, df, df_30, df_14, df_7, order):
-    df = df.drop("relay", axis=1).drop_duplicates()
-    df = df[df["builder"] != "missed"]
-    _df = df['builder'].value_counts().reset_index()
-    _df.columns = ["builder", "count"]
-    _df = pd.merge(_df,order,how="left", left_on="builder", right_on="builder")
-    _df["builder"]= _df["builder"].apply(lambda x: x[0].upper()+x[1:])
-    order["builder"]= order["builder"].apply(lambda x: x[0].upper()+x[1:])
-    _df.columns = ['builder', 'count', 'slots']
-    _df["relative_count"] = round(_df['count'] / _df['slots'] * 100, 5)
-    _df = _df[_df["count"] > 0]
-    _df["validator"] = _df["builder"].apply(lambda x: x[0:9]+"..." if x.startswith("0x") else x)
-    _df.sort_values("relative_count", ascending=False, inplace=True)
-    _df = _df.iloc[0:12]
-    fig = make_subplots(rows=1, cols=1)
-    
-    colors = [
-        '#1f77b4', # blue
-        '#ff7f0e', # orange
-        '#2ca02c', # green
-        '#d62728', # red
-        '#9467bd', # purple
-        '#8c564b', # brown
-        '#e377c2', # pink
-        '#7f7f7f', # grey
-        '#bcbd22', # olive
-        '#17becf'  # teal
-            ]
-    for index, row in _df.iterrows():
-        builder = row['builder']
-        relative_count = row['relative_count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[relative_count], 
-                y=[builder], 
-                orientation='h', 
-                marker=dict(color=color),
-                hovertemplate=f'<b>{builder}: {relative_count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    for i in order["builder"]:
-        if i not in _df['builder'].values.tolist():
-            fig.add_trace(go.Bar())
-
-    # Create the absolute bars
-    for index, row in _df.iterrows():
-        builder = row['builder']
-        count = row['count']
-        color = colors[index % len(colors)]
-
-        fig.add_trace(
-            go.Bar(
-                x=[count], 
-                y=[builder], 
-                orientation='h', 
-                marker=dict(color=color), 
-                visible=False,
-                hovertemplate=f'<b>{builder}: {count}</b><extra></extra>',
-                showlegend=False
-            )
-        )
-    for i in order["builder"]:
-        if i not in _df['builder'].values.tolist():
-            fig.add_trace(go.Bar())
-
-    fig.update_layout(**fig6_layout())
-    fig.update_yaxes(title_standoff=5)
-    
-    return fig
-
-def fig7_layout(width=801):
-    if width <= 800:
-        font_size = 10
-    else:
-        font_size = 20
-    return dict(
-        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per CL Client<br><span style="font-size:{font_size-3}px;">(last 30 days)</span></span>',
-        xaxis_title='Date',
-        yaxis_title='Slots',
-        margin=dict(l=20, r=20, t=80, b=20),
-        font=dict(family="Ubuntu Mono", size=font_size),
-        hovermode = "x unified",
-        hoverlabel=dict(
-            font_size=font_size,
-            font_family="Ubuntu Mono"
-        ),
-        barmode='stack',
-        xaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff"   ,     
-            gridwidth=1.5   ,     
-        ),
-        yaxis=dict(
-            fixedrange=True, 
-            showgrid=True,
-            gridcolor="#ffffff",
-            gridwidth=1.5,
-        ),
-        legend=dict(
-            x=1,           # x position of the legend (1 corresponds to the right end of the plot)
-            y=1,           # y position of the legend (1 corresponds to the top of the plot)
-            xanchor="auto",  # x anchor of the legend
-            yanchor="auto",  # y anchor of the legend
-            bgcolor="rgba(255, 255, 255, 0.5)" # You can set a background color for readability if needed
-        ),
-        updatemenus=[dict(
-            type="buttons",
-            buttons=[
-                dict(args=[{"visible": [True if i %2==0 else False for i in range(10)]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per CL Client<br><span style="font-size:{font_size-3}px;">(last 30 days)</span></span>',
-                            "xaxis.title": "%",
-                           }],
-                    label="Relative",
-                    method="update"
-                ),
-                dict(args=[{"visible": [False if i %2==0 else True for i in range(10)]},
-                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per CL Client<br><span style="font-size:{font_size-3}px;">(last 30 days)</span></span>',
-                            "xaxis.title": "slots",
-                           }],
-                    label="Absolute",
-                    method="update"
-                )
-            ],
-            showactive=True,
-            direction='left',
-            active=1,
-            x=1.0,
-            xanchor='right',
-            y=1.15,
-            yanchor='top'
-        )]
-    )
-
-def create_fig_stacked(df_90, df_60, df, df_14, df_7, order):
-    df = df.drop("relay", axis=1).drop_duplicates()
-    df = df[~df['cl_client'].str.contains('Unknown')]
-    df = df[df["cl_client"] != "missed"]
-    df.loc[:,"date"] = df["date"].apply(lambda x: x.split(" ")[0])
-    _df = df.groupby(["date","cl_client"])["slot"].count().reset_index()
-    _df = pd.merge(_df,order,how="left", left_on="cl_client", right_on="cl_client")
-    _df["cl_client"]= _df["cl_client"].apply(lambda x: x[0].upper()+x[1:])
-    _df.columns = ['date', 'cl_client', 'slot', 'slots']
-    _df["relative_count"] = round(_df['slot'] / _df['slots'] * 100, 5)
-    _df.sort_values("relative_count", ascending=False, inplace=True)
-    _df = orderclclient(_df)
-
-    fig = make_subplots(rows=1, cols=1)
-
-    # Colors array (can be extended with more colors)
-    colors = [
-        '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
-        '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
-    ]
-
-    # Add traces for each client
-    for i, client in enumerate(_df["cl_client"].unique()):
-        df = _df[_df["cl_client"] == client]
-        fig.add_trace(
-            go.Bar(
-                x=df["date"], 
-                y=df["relative_count"], 
-                name=client, 
-                marker_color=colors[i], 
-                visible=False, 
-                hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>'
-             )
-        )
-        fig.add_trace(
-            go.Bar(x=df["date"], y=df["slot"], 
-                   name=client, marker_color=colors[i],hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>'
-                  )
-        )
-        
-    fig.update_layout(**fig7_layout())
-    
-    fig.update_yaxes(title_standoff=5)
-    return fig
-
-
-
-# Figures
-def create_figures(df_90, df_60, df_30, df_14, df_7, df_per_sie_60, df_per_sie_30, df_per_sie_14, df_per_sie_7, df2, df3, df4, df5, dfreorger):
-    fig1 = create_fig1(df_90, df_60, df_30, df_14, df_7)
-    fig2 = create_fig2(df_90, df_60, df_30, df_14, df_7, df5)
-    fig3 = create_fig3(df_per_sie_60, df_per_sie_30, df_per_sie_14, df_per_sie_7)
-    fig4 = create_fig_for_validators(df_90, df_60, df_30, df_14, df_7, df2)
-    fig5 = create_fig_for_relays(df_90, df_60, df_30, df_14, df_7, df3)
-    fig6 = create_fig_for_builders(df_90, df_60, df_30, df_14, df_7, df4)
-    fig7 = create_fig_stacked(df_90, df_60, df_30, df_14, df_7, df5)
-    fig8 = create_reorger_relay(df_90, df_60, df_30, df_14, df_7, df3, dfreorger)
-    fig9 = create_reorger_validator(df_90, df_60, df_30, df_14, df_7, df2, dfreorger)
-    fig10 = create_reorger_builder(df_90, df_60, df_30, df_14, df_7, df4, dfreorger)
-    return fig1, fig2, fig3, fig4, fig5, fig6, fig7, fig8, fig9, fig10
-
-df_90, df_60, df_30, df_14, df_7, df_table, df_per_sie_60, df_per_sie_30, df_per_sie_14, df_per_sie_7, df2, df3, df4, df5, dfreorger = prepare_data()
-fig1, fig2, fig3, fig4, fig5, fig6, fig7, fig8, fig9, fig10 = create_figures(df_90, df_60, df_30, df_14, df_7, df_per_sie_60, df_per_sie_30, df_per_sie_14, df_per_sie_7, df2, df3, df4, df5, dfreorger)
+# Figures, layout deltas and table columns come prebuilt from the ETL snapshot,
+# memory-mapped so workers share its pages; a background watcher swaps in a new
+# one when the data files change
+live_snapshot()
 
 # Initialize the Dash app
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
@@ -1325,6 +60,10 @@ app.clientside_callback(
 )
 app.title = 'Reorg.pics'
 server = app.server
+# Prometheus-style request, payload and RSS metrics at /metrics, for loopback clients only
+init_metrics(server, generation=lambda: live_snapshot()[0])
+# Gzip/Brotli and ETags; the layout is cached per snapshot generation and revalidated with 304s
+init_http_caching(server, generation=lambda: live_snapshot()[0])
 
 def table_styles(width):
     font_size = '20px' if width >= 800 else '10px'
@@ -1338,227 +77,134 @@ def table_styles(width):
         {'if': {'column_id': 'CL Client'}, 'maxWidth': '80px', 'fontSize': font_size}
     ]
 
-@app.callback(
-    Output('main-div', 'style'),
-    Input('window-size-store', 'data')
-)
-def update_main_div_style(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-
-    window_width = window_size_data['width']
-    if window_width > 800:
-        return {'margin-right': '110px', 'margin-left': '110px'}
-    else:
-        return {}
+TABLE_PAGE_SIZE = 15
 
-app.layout = html.Div(
-    [
-        dbc.Container(
+def serve_layout():
+    # Evaluated per page load, so a hot-reloaded snapshot is picked up without a restart
+    snapshot = live_snapshot()[1]
+    figures = snapshot_figures(snapshot)
+    table = snapshot["table"]
+    return html.Div(
         [
-            # Title
-            dbc.Row(html.H1("Ethereum Reorg Dashboard", style={'text-align': 'center','margin-top': '20px'}), className="mb-4"),
-            html.Div([
-                dbc.Row([
-                    dbc.Col(
-                        html.H5(
-                            ['Built with 🖤 by ', html.A('Toni Wahrstätter', href='https://twitter.com/nero_eth', target='_blank')],
-                            className="mb-4 even-smaller-text" # Apply the class
+            dbc.Container(
+            [
+                # Title
+                dbc.Row(html.H1("Ethereum Reorg Dashboard", style={'text-align': 'center','margin-top': '20px'}), className="mb-4"),
+                html.Div([
+                    dbc.Row([
+                        dbc.Col(
+                            html.H5(
+                                ['Built with 🖤 by ', html.A('Toni Wahrstätter', href='https://twitter.com/nero_eth', target='_blank')],
+                                className="mb-4 even-smaller-text" # Apply the class
+                            ),
+                            width={"size": 6, "order": 1}
                         ),
-                        width={"size": 6, "order": 1}
-                    ),
+                        dbc.Col(
+                            html.H5(
+                                ['Built using ', html.A('blockprint', href='https://github.com/sigp/blockprint', target='_blank')],
+                                className="mb-4 even-smaller-text text-right",
+                                style={'textAlign': 'right'}
+                            ),
+                            width={"size": 6, "order": 2}
+                        )
+                    ])
+                ]),
+                dbc.Row(
+                   html.H5(
+                            ['Reorg Overview', ' (last 30 days)'],
+                            className="mb-4 smaller-text" # Apply the class
+                        )
+                ),
+                dbc.Row(
                     dbc.Col(
-                        html.H5(
-                            ['Built using ', html.A('blockprint', href='https://github.com/sigp/blockprint', target='_blank')],
-                            className="mb-4 even-smaller-text text-right",
-                            style={'textAlign': 'right'}
+                        dash_table.DataTable(
+                            style_cell_conditional=table_styles(799),
+                            id='table',
+                            columns=[
+                                {"name": i, 
+                                 "id": i, 
+                                 'presentation': 'markdown'} if i == 'Slot' else {"name": i, "id": i} for i in table["columns"]#[:-1]
+                            ],# + [{"name": 'slot_sort', "id": 'slot_sort', "hidden": True}],
+                            # Only the visible page is shipped; paging and sorting run on the server
+                            data=table_page(table, 0, TABLE_PAGE_SIZE),
+                            page_action='custom',
+                            page_current=0,
+                            page_size=TABLE_PAGE_SIZE,
+                            page_count=page_count(table, TABLE_PAGE_SIZE),
+                            style_table={'overflowX': 'auto'},
+                            style_cell={'whiteSpace': 'normal','height': 'auto'},
+                            style_data_conditional=[
+                                {'if': {'row_index': 'odd'}, 'backgroundColor': 'rgb(248, 248, 248)'},
+                            ],
+                            style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'},
+                            style_header_conditional=[
+                                {'if': {'column_id': 'Slot'}, 'text-align': 'center'},
+                                {'if': {'column_id': 'Parent Slot'}, 'text-align': 'center'},
+                                {'if': {'column_id': 'Slot Nr. in Epoch'}, 'text-align': 'center'},
+                            ],
+                            css=[dict(selector="p", rule="margin: 0; text-align: center")],
+                            sort_action="custom",
+                            sort_mode="single",
+                            sort_by=[]
+
                         ),
-                        width={"size": 6, "order": 2}
-                    )
-                ])
-            ]),
-            dbc.Row(
-               html.H5(
-                        ['Reorg Overview', ' (last 30 days)'],
-                        className="mb-4 smaller-text" # Apply the class
+                        className="mb-4", md=12
                     )
-            ),
-            dbc.Row(
-                dbc.Col(
-                    dash_table.DataTable(
-                        style_cell_conditional=table_styles(799),
-                        id='table',
-                        columns=[
-                            {"name": i, 
-                             "id": i, 
-                             'presentation': 'markdown'} if i == 'Slot' else {"name": i, "id": i} for i in df_table.columns#[:-1]
-                        ],# + [{"name": 'slot_sort', "id": 'slot_sort', "hidden": True}],
-                        data=df_table.to_dict('records'),
-                        page_size=15,
-                        style_table={'overflowX': 'auto'},
-                        style_cell={'whiteSpace': 'normal','height': 'auto'},
-                        style_data_conditional=[
-                            {'if': {'row_index': 'odd'}, 'backgroundColor': 'rgb(248, 248, 248)'},
-                        ],
-                        style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'},
-                        style_header_conditional=[
-                            {'if': {'column_id': 'Slot'}, 'text-align': 'center'},
-                            {'if': {'column_id': 'Parent Slot'}, 'text-align': 'center'},
-                            {'if': {'column_id': 'Slot Nr. in Epoch'}, 'text-align': 'center'},
-                        ],
-                        css=[dict(selector="p", rule="margin: 0; text-align: center")],
-                        sort_action="native",
-                        sort_mode="single"
-
-                    ),
-                    className="mb-4", md=12
-                )
-            ),
+                ),
 
-            # Graphs
-            dbc.Row(dbc.Col(dcc.Graph(id='graph1', figure=fig1), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph7', figure=fig7), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph3', figure=fig3), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph2', figure=fig2), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph4', figure=fig4), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph5', figure=fig5), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph6', figure=fig6), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph8', figure=fig8), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph9', figure=fig9), md=12, className="mb-4")),
-            dbc.Row(dbc.Col(dcc.Graph(id='graph10', figure=fig10), md=12, className="mb-4")),
+                # Graphs
+                dbc.Row(dbc.Col(dcc.Graph(id='graph1', figure=figures['graph1']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph7', figure=figures['graph7']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph3', figure=figures['graph3']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph2', figure=figures['graph2']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph4', figure=figures['graph4']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph5', figure=figures['graph5']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph6', figure=figures['graph6']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph8', figure=figures['graph8']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph9', figure=figures['graph9']), md=12, className="mb-4")),
+                dbc.Row(dbc.Col(dcc.Graph(id='graph10', figure=figures['graph10']), md=12, className="mb-4")),
+
+                # Additional Components
+                dbc.Row(dcc.Interval(id='window-size-trigger', interval=1000, n_intervals=0, max_intervals=1)),
+                dcc.Store(id='window-size-store',data={'width': 800}),
+                dcc.Store(id='layout-deltas-store', data={
+                    'graphs': snapshot["layout_deltas"],
+                    'table': {'narrow': table_styles(799), 'wide': table_styles(800)},
+                    'main_div': {'narrow': {}, 'wide': {'margin-right': '110px', 'margin-left': '110px'}},
+                })
+            ],
+            fluid=True,
+        )],
+        id='main-div'  # This ID is used in the callback to update the style
+    )
 
-            # Additional Components
-            dbc.Row(dcc.Interval(id='window-size-trigger', interval=1000, n_intervals=0, max_intervals=1)),
-            dcc.Store(id='window-size-store',data={'width': 800})
-        ],
-        fluid=True,
-    )],
-    id='main-div'  # This ID is used in the callback to update the style
-)
+app.layout = serve_layout
 
 
 # Callbacks
 
-@app.callback(
+# Font-size and margin switches are applied in the browser with Plotly.relayout,
+# so resizing never round-trips the figures through the server
+app.clientside_callback(
+    "window.dash_clientside.apply_window_size",
+    Output('main-div', 'style'),
     Output('table', 'style_cell_conditional'),
-    Input('window-size-store', 'data')
-)
-def update_table_styles(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-
-    window_width = window_size_data['width']
-    return table_styles(window_width)
-
-
-@app.callback(
-    Output('graph1', 'figure'),
-    Input('window-size-store', 'data')
-)
-def update_layout1(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig1.update_layout(**fig1_layout(width))
-    return fig1
-
-@app.callback(
-    Output('graph2', 'figure'),
-    Input('window-size-store', 'data')
-)
-def update_layout2(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig2.update_layout(**fig2_layout(width))
-    return fig2
-
-@app.callback(
-    Output('graph3', 'figure'),
-    Input('window-size-store', 'data')
-)
-def update_layout3(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig3.update_layout(**fig3_layout(width))
-    return fig3
-
-@app.callback(
-    Output('graph4', 'figure'),
-    Input('window-size-store', 'data')
-)
-def update_layout4(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig4.update_layout(**fig4_layout(width))
-    return fig4
-
-@app.callback(
-    Output('graph5', 'figure'),
-    Input('window-size-store', 'data')
-)
-def update_layout5(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig5.update_layout(**fig5_layout(width))
-    return fig5
-
-@app.callback(
-    Output('graph6', 'figure'),
-    Input('window-size-store', 'data')
-)
-def update_layout6(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig6.update_layout(**fig6_layout(width))
-    return fig6
-@app.callback(
-    Output('graph7', 'figure'),
-    Input('window-size-store', 'data')
-)
-def update_layout7(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig7.update_layout(**fig7_layout(width))
-    return fig7
-
-@app.callback(
-    Output('graph8', 'figure'),
-    Input('window-size-store', 'data')
-)
-def update_layout8(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig8.update_layout(**create_reorger_relay_layout(width))
-    return fig8
-
-@app.callback(
-    Output('graph9', 'figure'),
-    Input('window-size-store', 'data')
+    Input('window-size-store', 'data'),
+    State('layout-deltas-store', 'data')
 )
-def update_layout9(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig9.update_layout(**create_reorger_validator_layout(width))
-    return fig9
 
 @app.callback(
-    Output('graph10', 'figure'),
-    Input('window-size-store', 'data')
+    Output('table', 'data'),
+    Output('table', 'page_count'),
+    Input('table', 'page_current'),
+    Input('table', 'page_size'),
+    Input('table', 'sort_by'),
+    prevent_initial_call=True
 )
-def update_layout10(window_size_data):
-    if window_size_data is None:
-        raise dash.exceptions.PreventUpdate
-    width = window_size_data['width']
-    fig10.update_layout(**create_reorger_builder_layout(width))
-    return fig10
+def update_table(page_current, page_size, sort_by):
+    # page_count follows the snapshot, which a hot reload may have swapped since the page loaded
+    table = live_snapshot()[1]["table"]
+    return table_page(table, page_current, page_size, sort_by), page_count(table, page_size)
 
 if __name__ == '__main__':
     #app.run_server(debug=True)
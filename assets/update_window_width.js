@@ -5,6 +5,26 @@ window.dash_clientside = Object.assign({}, window.dash_clientside, {
             width: window.innerWidth || document.documentElement.clientWidth || document.body.clientWidth,
             height: window.innerHeight || document.documentElement.clientHeight || document.body.clientHeight
         };
+    },
+    // Thresholds match fig*_layout (<= 800), table_styles (>= 800) and the main-div margins (> 800)
+    apply_window_size: function(windowSize, deltas) {
+        if (!windowSize || !deltas) {
+            throw window.dash_clientside.PreventUpdate;
+        }
+        var width = windowSize.width;
+        var graphBucket = width <= 800 ? 'narrow' : 'wide';
+        if (window.Plotly) {
+            Object.keys(deltas.graphs).forEach(function(graphId) {
+                var graphDiv = document.querySelector('#' + graphId + ' .js-plotly-plot');
+                if (graphDiv) {
+                    window.Plotly.relayout(graphDiv, deltas.graphs[graphId][graphBucket]);
+                }
+            });
+        }
+        return [
+            deltas.main_div[width > 800 ? 'wide' : 'narrow'],
+            deltas.table[width >= 800 ? 'wide' : 'narrow']
+        ];
     }
 });
 
@@ -14,5 +34,4 @@ window.addEventListener('resize', function() {
     }
 });
 
-   
 
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# Benchmarks for the dashboard build on synthetic reorg histories
+#
+# Usage: python benchmark.py [--days 90 365 730 1825] [--max-growth 2.0]
+#                            [--baseline bench.json [--save-baseline]] [--max-regression 1.5]
+#                            [--etl-rows 1000000]
+# For every history length the slot stores and *_slots.csv leaderboards are
+# generated into a temp directory, then prepare_data, each create_fig* and
+# create_figures are timed there. Exits non-zero when the per-day cost of any
+# of them grows more than --max-growth times from the shortest to the longest
+# history (i.e. not linear), or when a timing is more than --max-regression
+# times slower than the saved --baseline.
+# --etl-rows also times the ETL slot transforms against the old per-row helpers.
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from reorg_store import REORG_STORE, REORGERS_STORE, DAILY_STORE, EPOCH_ROLLUP_STORE, EPOCH_ROLLUP_DIMENSIONS, SLOTS_PER_DAY, SLOTS_PER_EPOCH, current_slot, to_store_frame, write_store, slot_to_datetime, clean_text, daily_rollup, merge_rollup
+
+HEAD_SLOT = current_slot()
+# Cardinalities and client mix follow the production store
+CLIENTS = ["Unknown", "Lighthouse", "Prysm", "Nimbus", "Teku", "missed", "Lodestar"]
+CLIENT_WEIGHTS = [0.32, 0.23, 0.21, 0.12, 0.09, 0.02, 0.01]
+VALIDATORS = ["lido", "missed", "ether.fi", "binance", "kiln", "figment", "coinbase", "kraken", "celsius", "blockdaemon", "rocketpool", "everstake"] + [f"0x{i:096x}" for i in range(556)]
+BUILDERS = ["Titan Builder", "beaverbuild.org", "rsync-builder.xyz", "BuilderNet (Beaver)", "Bob the builder"] + [f"builder{i}" for i in range(13)]
+RELAYS = ["ultrasound", "bloxroute (max profit)", "bloxroute (regulated)", "flashbots", "titan", "agnostic Gnosis", "aestus"]
+LEADERBOARDS = {"validator_slots.csv": ("validator", VALIDATORS[:10]), "relay_slots.csv": ("relay", RELAYS),
+                "builder_slots.csv": ("builder", BUILDERS[:10]), "clclient_slots.csv": ("cl_client", ["Lighthouse", "Nimbus", "Prysm", "Teku", "missed", "Lodestar"])}
+
+
+def synthetic_reorgs(days, reorgs_per_day=30, seed=0):
+    """Build a store frame with `days` of randomly placed reorged slots"""
+    rng = np.random.default_rng(seed)
+    n = days * reorgs_per_day
+    slots = np.sort(rng.integers(HEAD_SLOT - days * SLOTS_PER_DAY, HEAD_SLOT, n))
+    df = pd.DataFrame({
+        "slot": slots,
+        # About half of the parent slots are unknown (0) in production
+        "parent_slot": np.where(rng.random(n) < 0.5, 0, slots - rng.integers(1, 3, n)),
+        "cl_client": rng.choice(CLIENTS, n, p=CLIENT_WEIGHTS),
+        "validator_id": rng.integers(0, 1_500_000, n),
+        "validator": rng.choice(VALIDATORS, n),
+        "builder": rng.choice(BUILDERS, n),
+        "relay": rng.choice(RELAYS, n),
+    })
+    return to_store_frame(df)
+
+
+def write_synthetic_history(days, directory, seed=0):
+    """Write both slot stores, the daily rollups and the *_slots.csv leaderboards for a `days` long history"""
+    rng = np.random.default_rng(seed)
+    reorgs = synthetic_reorgs(days, seed=seed)
+    write_store(reorgs, os.path.join(directory, REORG_STORE))
+    write_store(synthetic_reorgs(days, seed=seed + 1).drop("parent_slot", axis=1), os.path.join(directory, REORGERS_STORE))
+    # Proposed slots: every reorged slot plus a random number of canonical ones per cell
+    daily = daily_rollup(reorgs)
+    daily["slots"] = daily["reorgs"] + np.random.default_rng(seed + 2).integers(0, 300, len(daily))
+    merge_rollup(os.path.join(directory, DAILY_STORE), daily, daily["day"].min())
+    merge_rollup(os.path.join(directory, EPOCH_ROLLUP_STORE), daily_rollup(reorgs, EPOCH_ROLLUP_DIMENSIONS), daily["day"].min())
+    for path, (column, names) in LEADERBOARDS.items():
+        slots = np.sort(rng.integers(1, 300 * days, len(names)))[::-1]
+        pd.DataFrame({column: names, "slots": slots}).to_csv(os.path.join(directory, path), index=False)
+
+
+def best_of(func, repeat=3):
+    """Return the best wall time of `repeat` calls to func, after one warm-up call"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# prepare_data outputs, in order, and the figure functions called on them as create_figures does
+PREPARED = ["df_90", "df_60", "df_30", "df_14", "df_7", "df_table", "sie_counts", "df2", "df3", "df4", "df5", "dfreorger", "daily"]
+WINDOWS = ["df_90", "df_60", "df_30", "df_14", "df_7"]
+FIGURES = {
+    "create_fig1": ("create_fig1", ["daily"]),
+    "create_fig2": ("create_fig2", WINDOWS + ["df5"]),
+    "create_fig3": ("create_fig3", ["sie_counts"]),
+    "create_fig_for_validators": ("create_fig_for_validators", WINDOWS + ["df2"]),
+    "create_fig_for_relays": ("create_fig_for_relays", WINDOWS + ["df3"]),
+    "create_fig_for_builders": ("create_fig_for_builders", WINDOWS + ["df4"]),
+    "create_fig_stacked": ("create_fig_stacked", ["daily", "df5"]),
+    "create_reorger_relay": ("create_reorger_relay", WINDOWS + ["df3", "dfreorger"]),
+    "create_reorger_validator": ("create_reorger_validator", WINDOWS + ["df2", "dfreorger"]),
+    "create_reorger_builder": ("create_reorger_builder", WINDOWS + ["df4", "dfreorger"]),
+}
+
+
+def bench_history(days, repeat=3):
+    """Time prepare_data, each figure function and create_figures on one synthetic history"""
+    import reorg_figures
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        write_synthetic_history(days, directory)
+        # prepare_data reads the stores and leaderboards from the working directory
+        os.chdir(directory)
+        try:
+            results = {"prepare_data": best_of(reorg_figures.prepare_data, repeat)}
+            prepared = dict(zip(PREPARED, reorg_figures.prepare_data()))
+        finally:
+            os.chdir(cwd)
+    for name, (func, args) in FIGURES.items():
+        results[name] = best_of(lambda: getattr(reorg_figures, func)(*(prepared[arg] for arg in args)), repeat)
+    figure_args = [prepared[name] for name in PREPARED if name != "df_table"]
+    results["create_figures"] = best_of(lambda: reorg_figures.create_figures(*figure_args), repeat)
+    for name, seconds in results.items():
+        print(f"{name:<26} {days:>5} days: {seconds * 1000:8.1f} ms")
+    return results
+
+
+def bench_suite(days_list, repeat=3):
+    """Run bench_history for every history length, as {days: {benchmark: seconds}}"""
+    return {days: bench_history(days, repeat) for days in days_list}
+
+
+def etl_frame(rows, seed=0):
+    """Raw BigQuery-shaped result with `rows` slots and dirty builder names"""
+    rng = np.random.default_rng(seed)
+    builders = np.array(BUILDERS + ["Titan\x00 Builder", "beaver\u00a0build\x7f", "\u26a1builder\n", None], dtype=object)
+    return pd.DataFrame({
+        "slot": rng.integers(HEAD_SLOT - 365 * SLOTS_PER_DAY, HEAD_SLOT, rows),
+        "builder": rng.choice(builders, rows),
+    })
+
+
+def per_row_transforms(df):
+    """The ETL's previous per-row .apply helpers, kept as the reference"""
+    def clean_data(text):
+        if isinstance(text, str):
+            return re.sub(r'[^\x20-\x7E]', '', text)
+        return text
+    df = df.copy()
+    df["date"] = df["slot"].apply(lambda slot: datetime.utcfromtimestamp(1606824023 + slot * 12).strftime("%Y-%m-%d %H:%M:%S"))
+    df["slot_in_epoch"] = df["slot"].apply(lambda slot: slot % 32)
+    df["builder"] = df["builder"].apply(clean_data)
+    return df
+
+
+def vectorized_transforms(df):
+    """Whole-column transforms as used by reorg-pics-dataprep.py"""
+    df = df.copy()
+    df["date"] = slot_to_datetime(df["slot"])
+    df["slot_in_epoch"] = df["slot"] % SLOTS_PER_EPOCH
+    df["builder"] = clean_text(df["builder"])
+    return df
+
+
+def bench_etl_transforms(rows, repeat=3):
+    """Time the ETL slot transforms, per-row against vectorized, and check they agree"""
+    df = etl_frame(rows)
+    expected, actual = per_row_transforms(df), vectorized_transforms(df)
+    assert (pd.to_datetime(expected["date"]) == actual["date"]).all()
+    assert (expected["slot_in_epoch"] == actual["slot_in_epoch"]).all()
+    assert expected["builder"].equals(actual["builder"])
+    per_row = best_of(lambda: per_row_transforms(df), repeat)
+    vectorized = best_of(lambda: vectorized_transforms(df), repeat)
+    print(f"ETL transforms {rows} rows: per-row {per_row * 1000:8.1f} ms, vectorized {vectorized * 1000:8.1f} ms ({per_row / vectorized:.0f}x)")
+    return per_row, vectorized
+
+
+def check_linear(results, max_growth):
+    """Compare per-day cost of the longest history against the shortest one for every benchmark"""
+    shortest, longest = min(results), max(results)
+    ok = True
+    for name in results[shortest]:
+        growth = (results[longest][name] / longest) / (results[shortest][name] / shortest)
+        if growth > max_growth:
+            print(f"{name}: per-day cost growth {shortest} -> {longest} days is {growth:.2f}x (limit {max_growth:.2f}x)")
+            ok = False
+    return ok
+
+
+def check_baseline(results, baseline, max_regression):
+    """Compare every timing against a saved baseline run"""
+    ok = True
+    for days, timings in results.items():
+        for name, seconds in timings.items():
+            before = baseline.get(str(days), {}).get(name)
+            if before and seconds / before > max_regression:
+                print(f"{name} {days} days: {seconds * 1000:.1f} ms vs baseline {before * 1000:.1f} ms ({seconds / before:.2f}x, limit {max_regression:.2f}x)")
+                ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard build on synthetic histories")
+    parser.add_argument("--days", type=int, nargs="+", default=[90, 365, 730, 1825])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-growth", type=float, default=2.0)
+    parser.add_argument("--baseline", help="JSON timings of an earlier run to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run to --baseline instead of comparing")
+    parser.add_argument("--max-regression", type=float, default=1.5)
+    parser.add_argument("--etl-rows", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.etl_rows:
+        bench_etl_transforms(args.etl_rows, args.repeat)
+
+    results = bench_suite(args.days, args.repeat)
+    ok = check_linear(results, args.max_growth)
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({str(days): timings for days, timings in results.items()}, f, indent=2)
+        print(f"Baseline written: {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            ok = check_baseline(results, json.load(f), args.max_regression) and ok
+    if not ok:
+        print("Dashboard build benchmarks regressed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
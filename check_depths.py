@@ -3,6 +3,7 @@
 
 from pyxatu import PyXatu
 import pandas as pd
+from pyxatu_cache import range_query
 
 print("Analyzing depth reporting differences...")
 
@@ -17,17 +18,17 @@ with PyXatu() as xatu:
     
     print(f"Checking slots {start_slot} to {current_slot}")
     
-    reorg_query = f"""
+    reorg_query = """
     SELECT 
         slot - depth as slot,
         depth
     FROM beacon_api_eth_v1_events_chain_reorg
-    WHERE slot BETWEEN {start_slot} AND {current_slot}
+    WHERE slot >= {lo} AND slot < {hi}
         AND meta_network_name = 'mainnet'
     ORDER BY slot DESC
     """
     
-    reorgs = xatu.raw_query(reorg_query)
+    reorgs = range_query(xatu, reorg_query, start_slot, current_slot + 1)
     
     print(f"Found {len(reorgs)} reorg reports")
     
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# On-disk cache for PyXatu query results
+#
+# Results are stored as one Parquet file per (normalized SQL, slot range),
+# named by the hash of both. Ranges that end before the finalized head can no
+# longer change, so they are served from disk forever; only the unfinalized
+# tail is queried again on every run. The least recently used files are
+# evicted once the cache grows past PYXATU_CACHE_MAX_BYTES.
+
+import os
+import re
+import hashlib
+import pandas as pd
+from reorg_store import SLOTS_PER_DAY, SLOTS_PER_EPOCH, current_slot
+
+CACHE_DIR = os.environ.get("PYXATU_CACHE_DIR", ".pyxatu-cache")
+CACHE_MAX_BYTES = int(os.environ.get("PYXATU_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+# Slots behind the head that may still be reorged; finality takes two epochs
+FINALITY_SLOTS = 3 * SLOTS_PER_EPOCH
+# Slots queried beyond each end of a missed-slot range, so misses on its edges are found
+MISSED_PAD_SLOTS = SLOTS_PER_EPOCH
+
+
+def normalize_sql(sql):
+    """Collapse whitespace so formatting differences map to the same cache entry"""
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def cache_path(sql, slot_range, cache_dir=CACHE_DIR):
+    """Content address of a query result for a half-open slot range"""
+    key = f"{normalize_sql(sql)}\n{slot_range[0]}:{slot_range[1]}"
+    return os.path.join(cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".parquet")
+
+
+def is_finalized(slot_range):
+    """Whether every slot in the half-open range is past finality"""
+    return slot_range[1] <= current_slot() - FINALITY_SLOTS
+
+
+def cached_result(sql, slot_range, fetch, cache_dir=CACHE_DIR):
+    """Return fetch() for a slot range, from disk when the range is finalized and cached"""
+    if not is_finalized(slot_range):
+        return fetch()
+    path = cache_path(sql, slot_range, cache_dir)
+    try:
+        df = pd.read_parquet(path)
+        os.utime(path)  # mark as recently used for eviction
+        return df
+    except (OSError, ValueError):
+        pass
+    df = fetch()
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    evict(cache_dir)
+    return df
+
+
+def cached_query(xatu, sql, slot_range, cache_dir=CACHE_DIR):
+    """xatu.raw_query(sql) cached under the slot range the query covers"""
+    return cached_result(sql, slot_range, lambda: xatu.raw_query(sql), cache_dir)
+
+
+def cached_missed_slots(xatu, slot_range, cache_dir=CACHE_DIR, pad_slots=MISSED_PAD_SLOTS):
+    """xatu.get_missed_slots for a slot range, cached like a query
+
+    PyXatu reports missed slots as gaps between the lowest and highest
+    canonical slot it sees, so a miss on the first or last slot of a range
+    would be lost; the range is queried with pad_slots on both sides and the
+    result cut back to it.
+    """
+    lo, hi = slot_range
+    padded = (max(0, lo - pad_slots), hi + pad_slots)
+    # get_missed_slots returns a set; sort it so the cached frame is deterministic
+    fetch = lambda: pd.DataFrame({"slot": pd.Series(sorted(xatu.get_missed_slots(slot_range=list(padded))), dtype="int64")})
+    slots = cached_result("get_missed_slots", padded, fetch, cache_dir)["slot"]
+    return slots[(slots >= lo) & (slots < hi)].tolist()
+
+
+def block_ranges(start_slot, end_slot, block_slots=SLOTS_PER_DAY):
+    """Split [start_slot, end_slot) on multiples of block_slots so ranges repeat across runs"""
+    bounds = list(range(start_slot - start_slot % block_slots + block_slots, end_slot, block_slots))
+    edges = [start_slot] + bounds + [end_slot]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def range_query(xatu, template, start_slot, end_slot, block_slots=SLOTS_PER_DAY, cache_dir=CACHE_DIR):
+    """Run a query template with {lo}/{hi} slot bounds block by block through the cache"""
+    frames = [cached_query(xatu, template.format(lo=lo, hi=hi), (lo, hi), cache_dir)
+              for lo, hi in block_ranges(start_slot, end_slot, block_slots)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def range_missed_slots(xatu, start_slot, end_slot, block_slots=SLOTS_PER_DAY, cache_dir=CACHE_DIR):
+    """Missed slots in [start_slot, end_slot), fetched block by block through the cache"""
+    return [slot for block in block_ranges(start_slot, end_slot, block_slots)
+            for slot in cached_missed_slots(xatu, block, cache_dir)]
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Delete the least recently used cache files until the cache fits in max_bytes"""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".parquet"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # evicted by a concurrent writer
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
@@ -3,11 +3,21 @@
 # Generates a stylish HTML file with reorg analytics
 
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import os
+import time
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pyxatu import PyXatu
 import json
+from plotly.utils import PlotlyJSONEncoder
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+from urllib.request import urlretrieve
+from reorg_store import PYXATU_STORE, PYXATU_DAILY_STORE, write_store, daily_rollup, merge_rollup, rollup_window
+from pyxatu_cache import block_ranges, cached_query, cached_missed_slots
+from run_report import stage, start_profile, write_report
 
 # Modern color palette
 COLORS = {
@@ -23,6 +33,13 @@ COLORS = {
     'light': '#f1f5f9'         # Light slate
 }
 
+# Backfills are fetched one day of slots per query, a few queries at a time
+FETCH_CHUNK_SLOTS = 7200
+FETCH_WORKERS = int(os.environ.get("PYXATU_FETCH_WORKERS", 4))
+FETCH_RETRIES = 3
+# Reorg events reported by fewer sentries are treated as node sync artifacts
+MIN_SENTRY_COUNT = int(os.environ.get("MIN_SENTRY_COUNT", 10))
+
 # Gradient colors for charts
 GRADIENT_COLORS = [
     '#6366f1', '#8b5cf6', '#a78bfa', '#c4b5fd', '#ddd6fe',
@@ -41,76 +58,122 @@ def get_current_slot():
     seconds_since_genesis = (current_time - genesis_time).total_seconds()
     return int(seconds_since_genesis / 12)
 
-def fetch_reorg_data_pyxatu(days_back=90):
-    """Fetch reorg data using pyxatu"""
+def slot_chunks(start_slot, end_slot, chunk_slots=FETCH_CHUNK_SLOTS):
+    """Split the half-open slot range [start_slot, end_slot) into chunks, newest first
+
+    Chunks are aligned to multiples of chunk_slots so that finalized chunks hit the
+    query cache on every later run.
+    """
+    return block_ranges(start_slot, end_slot, chunk_slots)[::-1]
+
+def with_retries(func, *args, retries=FETCH_RETRIES):
+    """Call func, retrying with exponential backoff before giving up"""
+    for attempt in range(retries):
+        try:
+            return func(*args)
+        except Exception as e:
+            if attempt == retries - 1:
+                raise
+            wait = 2 ** attempt
+            print(f"{func.__name__}{args[1:]} failed ({e}), retrying in {wait}s")
+            time.sleep(wait)
+
+def fetch_reorg_chunk(xatu, chunk, min_sentry_count=MIN_SENTRY_COUNT):
+    """Fetch the consensus reorg events and missed slots of one slot chunk"""
+    lo, hi = chunk
+    # Filter to events with consensus across >= min_sentry_count sentries.
+    # Single-sentry high-depth reports are node sync artifacts, not real chain reorgs. 
+    # Real reorgs are reported by nearly all sentries simultaneously.
+    # ClickHouse applies the filter, so only one row per reported event and depth
+    # crosses the wire instead of one row per sentry report.
+    reorg_query = f"""
+    SELECT 
+        reorg_slot - reported_depth as slot,
+        reported_depth as depth,
+        reorg_slot,
+        sentries
+    FROM (
+        SELECT 
+            slot as reorg_slot,
+            arrayJoin(groupUniqArray(depth)) as reported_depth,
+            count() as sentries
+        FROM beacon_api_eth_v1_events_chain_reorg
+        WHERE slot >= {lo} AND slot < {hi}
+            AND meta_network_name = 'mainnet'
+            AND meta_client_implementation != 'Contributoor'
+        GROUP BY slot
+        HAVING count() >= {min_sentry_count}
+    )
+    ORDER BY slot DESC
+    """
+    with stage("raw_query") as info:
+        reorgs = cached_query(xatu, reorg_query, chunk)
+        info["rows"], info["bytes"] = len(reorgs), reorgs.memory_usage(deep=True).sum()
+    with stage("get_missed_slots") as info:
+        missed_slots = cached_missed_slots(xatu, chunk)
+        info["rows"] = len(missed_slots)
+    return reorgs, missed_slots
+
+def fetch_reorg_data_pyxatu(days_back=90, min_sentry_count=MIN_SENTRY_COUNT, start_slot=None):
+    """Fetch reorg data using pyxatu, one slot chunk per query, from start_slot or days_back days ago"""
     print(f"Fetching reorg data for last {days_back} days...")
     
     current_slot = get_current_slot()
     slots_per_day = 7200
-    start_slot = current_slot - (days_back * slots_per_day)
+    if start_slot is None:
+        start_slot = current_slot - (days_back * slots_per_day)
+    chunks = slot_chunks(start_slot, current_slot + 1)
     
-    with PyXatu() as xatu:
-        # Query for reorgs - get all reports and we'll take minimum depth per slot
-        reorg_query = f"""
-        SELECT 
-            slot - depth as slot,
-            depth,
-            slot as reorg_slot
-        FROM beacon_api_eth_v1_events_chain_reorg
-        WHERE slot BETWEEN {start_slot} AND {current_slot}
-            AND meta_network_name = 'mainnet'
-            AND meta_client_implementation != 'Contributoor'
-        ORDER BY slot DESC
-        """
-        
-        print("Querying reorgs...")
-        reorgs_raw = xatu.raw_query(reorg_query)
-        
-        # Filter to events with consensus across >= MIN_SENTRY_COUNT sentries.
-        # Single-sentry high-depth reports are node sync artifacts, not real chain reorgs. 
-        # Real reorgs are reported by nearly all sentries simultaneously.
-        MIN_SENTRY_COUNT = 10
-        sentry_counts = reorgs_raw.groupby('reorg_slot').size()
-        valid_reorg_slots = sentry_counts[sentry_counts >= MIN_SENTRY_COUNT].index
-        reorgs_filtered = reorgs_raw[reorgs_raw['reorg_slot'].isin(valid_reorg_slots)]
-        print(f"Filtered to {len(valid_reorg_slots)} reorg events with >= {MIN_SENTRY_COUNT} sentry reports "
-              f"(dropped {len(sentry_counts) - len(valid_reorg_slots)} artifacts)")
+    partials, missed_slots = [], set()
+    with PyXatu() as xatu, ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        print(f"Querying reorgs and missed slots in {len(chunks)} chunks ({FETCH_WORKERS} workers)...")
+        futures = {pool.submit(with_retries, fetch_reorg_chunk, xatu, chunk, min_sentry_count): chunk for chunk in chunks}
+        for done, future in enumerate(as_completed(futures), start=1):
+            reorgs, chunk_missed = future.result()
+            partials.append((futures[future], reorgs))
+            missed_slots.update(chunk_missed)
+            if done % 30 == 0 or done == len(chunks):
+                print(f"  {done}/{len(chunks)} chunks fetched")
+
+    with stage("aggregate") as info:
+        # A reorged slot (reported slot - depth) can sit in an earlier chunk than its
+        # report, so the minimum depth is only taken once every chunk is in
+        partials.sort(key=lambda partial: partial[0], reverse=True)
+        events = pd.concat([reorgs for _, reorgs in partials], ignore_index=True)
+        print(f"Filtered to {events['reorg_slot'].nunique()} reorg events with >= {min_sentry_count} sentry reports")
 
         # Group by slot and take MINIMUM depth to avoid false positives
         print("Processing reorgs - taking minimum depth per slot...")
-        reorgs_df = reorgs_filtered.groupby('slot').agg({
+        reorgs_df = events.groupby('slot').agg({
             'depth': 'min',  # Take minimum depth to be conservative
             'reorg_slot': 'first'
         }).reset_index()
 
-        # Get missed slots
-        print("Getting missed slots...")
-        missed_slots = xatu.get_missed_slots(slot_range=[start_slot, current_slot])
-        
         # Filter reorgs to only those at missed slots
         reorgs_df = reorgs_df[reorgs_df["slot"].isin(missed_slots)]
+        info["rows"] = len(reorgs_df)
         
         # Add additional data
         reorgs_df['date'] = reorgs_df['slot'].apply(slot_to_time)
         reorgs_df['slot_in_epoch'] = reorgs_df['slot'] % 32
         reorgs_df['epoch'] = reorgs_df['slot'] // 32
-        
-        print(f"Found {len(reorgs_raw)} raw reorg reports, consolidated to {len(reorgs_df)} unique slots with minimum depths")
+    
+    raw_reports = int(events.drop_duplicates('reorg_slot')['sentries'].sum())
+    print(f"Found {raw_reports} consensus reorg reports, consolidated to {len(reorgs_df)} unique slots with minimum depths")
         
     return reorgs_df
 
-def create_time_series_chart(df, title="Reorgs Over Time", period_days=None):
-    """Create beautiful time series chart of reorgs"""
+def create_time_series_chart(daily, title="Reorgs Over Time", period_days=None):
+    """Create beautiful time series chart of reorgs from the daily rollup"""
     fig = go.Figure()
     
     if period_days:
         cutoff_date = datetime.utcnow() - timedelta(days=period_days)
-        df = df[df['date'] >= cutoff_date]
+        daily = daily[daily['day'] >= pd.Timestamp(cutoff_date).floor('D')]
     
-    # Group by date
-    df = df.copy()  # Create a copy to avoid SettingWithCopyWarning
-    df['date_str'] = df['date'].dt.strftime('%Y-%m-%d')
-    daily_counts = df.groupby('date_str').size().reset_index(name='count')
+    # One row per day; other rollup dimensions are summed away
+    counts = daily.groupby('day')['reorgs'].sum()
+    daily_counts = pd.DataFrame({'date_str': counts.index.strftime('%Y-%m-%d'), 'count': counts.to_numpy()})
     
     # Add main trace with gradient fill (no markers)
     fig.add_trace(go.Scatter(
@@ -469,72 +532,32 @@ def create_epoch_analysis_chart(df, title="Reorgs by Epoch"):
     
     return fig
 
-def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_dashboard_modern.html"):
-    """Generate a modern, stylish HTML file with all charts"""
-    
-    # Calculate statistics
-    total_reorgs = len(df)
-    avg_depth = df['depth'].mean() if 'depth' in df.columns else 1.0
-    max_depth = df['depth'].max() if 'depth' in df.columns else 1
-    today = datetime.utcnow().date()
-    reorgs_today = len(df[df['date'].dt.date == today]) if not df.empty else 0
-    reorgs_7d = len(df[df['date'] >= datetime.utcnow() - timedelta(days=7)])
-    reorgs_30d = len(df[df['date'] >= datetime.utcnow() - timedelta(days=30)])
-    
-    # Determine period label
-    if days_back >= 365:
-        period_label = f"last {days_back // 365} year{'s' if days_back >= 730 else ''}"
-    elif days_back >= 30:
-        months = days_back // 30
-        period_label = f"last {months} month{'s' if months > 1 else ''}"
-    elif days_back >= 7:
-        weeks = days_back // 7
-        period_label = f"last {weeks} week{'s' if weeks > 1 else ''}"
-    else:
-        period_label = f"last {days_back} day{'s' if days_back > 1 else ''}"
-    
-    # Prepare table data (last 100 reorgs)
-    df_table = df.sort_values('date', ascending=False).head(100).copy()
-    df_table['date_str'] = df_table['date'].dt.strftime('%Y-%m-%d %H:%M:%S UTC')
-    df_table['slot_link'] = df_table['slot'].apply(lambda x: f'<a href="https://beaconcha.in/slot/{x}" target="_blank">{x}</a>')
-    df_table['epoch_link'] = df_table['epoch'].apply(lambda x: f'<a href="https://beaconcha.in/epoch/{x}" target="_blank">{x}</a>')
-    
-    table_rows = []
-    for _, row in df_table.iterrows():
-        depth_class = 'depth-normal' if row['depth'] == 1 else 'depth-warning' if row['depth'] == 2 else 'depth-danger'
-        table_rows.append(f"""
-            <tr>
-                <td>{row['slot_link']}</td>
-                <td>{row['epoch_link']}</td>
-                <td class="{depth_class}">{row['depth']}</td>
-                <td>{row['slot_in_epoch']}</td>
-                <td>{row['date_str']}</td>
-            </tr>
-        """)
-    
-    html_template = """<!DOCTYPE html>
+# Static pieces of the dashboard page. They are written verbatim by the streaming
+# renderer below, so CSS and JS braces need no escaping.
+PAGE_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=5.0, user-scalable=yes">
     <title>Reorg.pics</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Ubuntu+Mono:wght@400;700&display=swap" rel="stylesheet">
+"""
+
+PAGE_STYLE = """    <link href="https://fonts.googleapis.com/css2?family=Ubuntu+Mono:wght@400;700&display=swap" rel="stylesheet">
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Ubuntu Mono', monospace;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             position: relative;
-        }}
+        }
         
-        body::before {{
+        body::before {
             content: "";
             position: fixed;
             top: 0;
@@ -544,23 +567,23 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             background: url('data:image/svg+xml,%3Csvg width="60" height="60" viewBox="0 0 60 60" xmlns="http://www.w3.org/2000/svg"%3E%3Cg fill="none" fill-rule="evenodd"%3E%3Cg fill="%23ffffff" fill-opacity="0.03"%3E%3Cpath d="M36 34v-4h-2v4h-4v2h4v4h2v-4h4v-2h-4zm0-30V0h-2v4h-4v2h4v4h2V6h4V4h-4zM6 34v-4H4v4H0v2h4v4h2v-4h4v-2H6zM6 4V0H4v4H0v2h4v4h2V6h4V4H6z"/%3E%3C/g%3E%3C/g%3E%3C/svg%3E');
             pointer-events: none;
             z-index: 1;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1600px;
             margin: 0 auto;
             padding: 20px;
             position: relative;
             z-index: 2;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .container {{
+        @media (max-width: 768px) {
+            .container {
                 padding: 10px;
-            }}
-        }}
+            }
+        }
         
-        .header {{
+        .header {
             text-align: center;
             padding: 50px 30px;
             background: rgba(255, 255, 255, 0.98);
@@ -569,9 +592,9 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             backdrop-filter: blur(10px);
             box-shadow: 0 20px 60px rgba(0,0,0,0.15);
             border: 1px solid rgba(255,255,255,0.5);
-        }}
+        }
         
-        h1 {{
+        h1 {
             color: #1e293b;
             font-size: 3.5em;
             margin-bottom: 15px;
@@ -580,22 +603,22 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
-        }}
+        }
         
-        .subtitle {{
+        .subtitle {
             color: #64748b;
             font-size: 1.1em;
             letter-spacing: 1px;
-        }}
+        }
         
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 25px;
             margin-bottom: 40px;
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: rgba(255, 255, 255, 0.98);
             border-radius: 20px;
             padding: 30px;
@@ -605,14 +628,14 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             border: 1px solid rgba(255,255,255,0.5);
             transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
             cursor: default;
-        }}
+        }
         
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-5px) scale(1.02);
             box-shadow: 0 20px 40px rgba(0,0,0,0.15);
-        }}
+        }
         
-        .stat-value {{
+        .stat-value {
             font-size: 3em;
             font-weight: 700;
             background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%);
@@ -620,17 +643,17 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             -webkit-text-fill-color: transparent;
             margin-bottom: 10px;
             line-height: 1;
-        }}
+        }
         
-        .stat-label {{
+        .stat-label {
             color: #64748b;
             font-size: 0.9em;
             text-transform: uppercase;
             letter-spacing: 2px;
             font-weight: 400;
-        }}
+        }
         
-        .chart-container {{
+        .chart-container {
             background: rgba(255, 255, 255, 0.98);
             border-radius: 25px;
             padding: 30px;
@@ -645,187 +668,187 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             /* CRITICAL: Prevent container collapse */
             min-height: 500px;
             position: relative;
-        }}
+        }
         
-        .chart-container > div {{
+        .chart-container > div {
             width: 100% !important;
             min-height: 450px !important;
             overflow: hidden;
             position: relative;
-        }}
+        }
         
         /* Ensure Plotly containers maintain minimum size */
-        .plotly-graph-div {{
+        .plotly-graph-div {
             width: 100% !important;
             min-height: 450px !important;
-        }}
+        }
         
-        .chart-container:hover {{
+        .chart-container:hover {
             box-shadow: 0 20px 40px rgba(0,0,0,0.15);
-        }}
+        }
         
-        .chart-grid {{
+        .chart-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(min(700px, 100%), 1fr));
             gap: 30px;
             margin-bottom: 30px;
             width: 100%;
             box-sizing: border-box;
-        }}
+        }
         
-        .footer {{
+        .footer {
             text-align: center;
             padding: 40px;
             color: rgba(255,255,255,0.9);
             font-size: 0.95em;
             letter-spacing: 1px;
-        }}
+        }
         
-        .footer a {{
+        .footer a {
             color: white;
             text-decoration: none;
             font-weight: 700;
             border-bottom: 2px solid transparent;
             transition: border-color 0.3s;
-        }}
+        }
         
-        .footer a:hover {{
+        .footer a:hover {
             border-bottom-color: white;
-        }}
+        }
         
         /* Mobile responsive styles */
-        @media (max-width: 768px) {{
-            .container {{
+        @media (max-width: 768px) {
+            .container {
                 padding: 10px;
-            }}
+            }
             
-            .header {{
+            .header {
                 padding: 30px 15px;
                 border-radius: 15px;
                 margin-bottom: 20px;
-            }}
+            }
             
-            h1 {{
+            h1 {
                 font-size: 2em;
-            }}
+            }
             
-            .subtitle {{
+            .subtitle {
                 font-size: 0.9em;
-            }}
+            }
             
-            .stats-grid {{
+            .stats-grid {
                 grid-template-columns: repeat(2, 1fr);
                 gap: 15px;
                 margin-bottom: 25px;
-            }}
+            }
             
-            .stat-card {{
+            .stat-card {
                 padding: 20px 15px;
                 border-radius: 15px;
-            }}
+            }
             
-            .stat-value {{
+            .stat-value {
                 font-size: 2em;
-            }}
+            }
             
-            .stat-label {{
+            .stat-label {
                 font-size: 0.75em;
                 letter-spacing: 1px;
-            }}
+            }
             
-            .chart-container {{
+            .chart-container {
                 padding: 15px;
                 border-radius: 15px;
                 margin-bottom: 20px;
                 width: 100%;
                 min-height: 400px;
-            }}
+            }
             
-            .chart-container > div {{
+            .chart-container > div {
                 width: 100% !important;
                 min-height: 380px !important;
-            }}
+            }
             
-            .chart-grid {{
+            .chart-grid {
                 grid-template-columns: 1fr;
                 gap: 20px;
-            }}
+            }
             
-            .table-container {{
+            .table-container {
                 padding: 15px;
                 border-radius: 15px;
                 margin-bottom: 20px;
-            }}
+            }
             
-            .table-title {{
+            .table-title {
                 font-size: 1.4em;
                 margin-bottom: 15px;
-            }}
+            }
             
-            table {{
+            table {
                 font-size: 12px;
-            }}
+            }
             
-            th {{
+            th {
                 padding: 10px 8px;
                 font-size: 11px;
-            }}
+            }
             
-            td {{
+            td {
                 padding: 8px;
                 font-size: 11px;
-            }}
+            }
             
-            .footer {{
+            .footer {
                 padding: 20px 10px;
                 font-size: 0.8em;
-            }}
-        }}
+            }
+        }
         
-        @media (max-width: 480px) {{
-            h1 {{
+        @media (max-width: 480px) {
+            h1 {
                 font-size: 1.6em;
-            }}
+            }
             
-            .stats-grid {{
+            .stats-grid {
                 grid-template-columns: 1fr;
-            }}
+            }
             
-            .stat-card {{
+            .stat-card {
                 padding: 15px;
-            }}
+            }
             
-            .stat-value {{
+            .stat-value {
                 font-size: 1.8em;
-            }}
+            }
             
-            .table-container {{
+            .table-container {
                 overflow-x: auto;
                 -webkit-overflow-scrolling: touch;
-            }}
+            }
             
-            table {{
+            table {
                 min-width: 100%;
                 width: max-content;
-            }}
-        }}
+            }
+        }
         
         /* Loading animation */
-        @keyframes pulse {{
-            0%, 100% {{
+        @keyframes pulse {
+            0%, 100% {
                 opacity: 1;
-            }}
-            50% {{
+            }
+            50% {
                 opacity: 0.5;
-            }}
-        }}
+            }
+        }
         
-        .loading {{
+        .loading {
             animation: pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite;
-        }}
+        }
         
         /* Table styles */
-        .table-container {{
+        .table-container {
             background: rgba(255, 255, 255, 0.98);
             border-radius: 25px;
             padding: 30px;
@@ -834,9 +857,9 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             box-shadow: 0 10px 30px rgba(0,0,0,0.1);
             border: 1px solid rgba(255,255,255,0.5);
             overflow-x: auto;
-        }}
+        }
         
-        .table-title {{
+        .table-title {
             font-size: 1.8em;
             font-weight: 700;
             color: #1e293b;
@@ -844,81 +867,81 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
-        }}
+        }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: separate;
             border-spacing: 0;
             font-family: 'Ubuntu Mono', monospace;
-        }}
+        }
         
-        thead {{
+        thead {
             background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%);
             color: white;
-        }}
+        }
         
-        th {{
+        th {
             padding: 15px;
             text-align: left;
             font-weight: 700;
             font-size: 14px;
             letter-spacing: 1px;
             text-transform: uppercase;
-        }}
+        }
         
-        th:first-child {{
+        th:first-child {
             border-top-left-radius: 10px;
-        }}
+        }
         
-        th:last-child {{
+        th:last-child {
             border-top-right-radius: 10px;
-        }}
+        }
         
-        td {{
+        td {
             padding: 12px 15px;
             border-bottom: 1px solid rgba(0,0,0,0.05);
             font-size: 13px;
             color: #334155;
-        }}
+        }
         
-        tbody tr {{
+        tbody tr {
             transition: all 0.2s;
-        }}
+        }
         
-        tbody tr:hover {{
+        tbody tr:hover {
             background: rgba(99, 102, 241, 0.05);
             transform: scale(1.01);
-        }}
+        }
         
-        td a {{
+        td a {
             color: #6366f1;
             text-decoration: none;
             font-weight: 700;
             transition: all 0.2s;
-        }}
+        }
         
-        td a:hover {{
+        td a:hover {
             color: #8b5cf6;
             text-decoration: underline;
-        }}
+        }
         
-        .depth-normal {{
+        .depth-normal {
             color: #10b981;
             font-weight: 700;
-        }}
+        }
         
-        .depth-warning {{
+        .depth-warning {
             color: #f59e0b;
             font-weight: 700;
-        }}
+        }
         
-        .depth-danger {{
+        .depth-danger {
             color: #ef4444;
             font-weight: 700;
-        }}
+        }
         
-        .table-info {{
+        .table-info {
             margin-top: 15px;
             padding: 10px;
             background: rgba(99, 102, 241, 0.1);
@@ -926,7 +949,7 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             font-size: 12px;
             color: #64748b;
             text-align: center;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -938,38 +961,9 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             </div>
         </div>
         
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-value">{total_reorgs}</div>
-                <div class="stat-label">Total Reorgs ({period_label})</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{reorgs_today}</div>
-                <div class="stat-label">Today</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{reorgs_7d}</div>
-                <div class="stat-label">Last 7 Days</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{reorgs_30d}</div>
-                <div class="stat-label">Last 30 Days</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{avg_depth:.2f}</div>
-                <div class="stat-label">Avg Depth ({period_label})</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value">{max_depth}</div>
-                <div class="stat-label">Max Depth ({period_label})</div>
-            </div>
-        </div>
-        
-        {chart_divs}
-        
-        <div class="table-container">
-            <div class="table-title">Recent Reorgs (Last 100)</div>
-            <table>
+"""
+
+TABLE_HEAD = """            <table>
                 <thead>
                     <tr>
                         <th>Slot</th>
@@ -980,25 +974,20 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
                     </tr>
                 </thead>
                 <tbody>
-                    {table_rows}
-                </tbody>
+"""
+
+TABLE_TAIL = """                </tbody>
             </table>
             <div class="table-info">
                 Click on slot or epoch numbers to view details on beaconcha.in
             </div>
         </div>
         
-        <div class="footer">
-            Built with 🖤 by <a href="https://twitter.com/nero_eth" target="_blank">Toni Wahrstätter</a> | 
-            Generated {timestamp} | 
-            Using <a href="https://github.com/nerolation/pyxatu" target="_blank">PyXatu</a> | 
-            Data from <a href="https://ethpandaops.io" target="_blank">EthPandaOps</a>
-        </div>
-    </div>
-    
-    <style>
+"""
+
+PAGE_SCRIPTS = """    <style>
         /* Loading overlay */
-        .loading-overlay {{
+        .loading-overlay {
             position: fixed;
             top: 0;
             left: 0;
@@ -1010,12 +999,12 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             justify-content: center;
             z-index: 9999;
             transition: opacity 0.3s ease;
-        }}
-        .loading-text {{
+        }
+        .loading-text {
             font-family: 'Ubuntu Mono', monospace;
             font-size: 24px;
             color: #6366f1;
-        }}
+        }
     </style>
     
     <div class="loading-overlay" id="loadingOverlay">
@@ -1024,7 +1013,7 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
     
     <script>
         // Elegant configuration - enable responsive with safety checks
-        const config = {{
+        const config = {
             staticPlot: false,      // Allow hover interactions
             responsive: true,       // Enable responsive but with custom handlers
             displayModeBar: false,
@@ -1033,13 +1022,13 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             showTips: false,
             editable: false,
             responsiveAnimationDuration: 0  // Instant resize without animation
-        }};
+        };
         
         // Store initial render state for each chart
         const chartStates = new Map();
         
         // Custom resize handler that prevents the collapsing bug
-        function safeResize(chartDiv) {{
+        function safeResize(chartDiv) {
             // Don't resize if document is hidden or container has no size
             if (document.hidden) return;
             
@@ -1047,158 +1036,370 @@ def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_
             if (rect.width < 100 || rect.height < 100) return;
             
             // Only resize if container has valid dimensions
-            try {{
+            try {
                 Plotly.Plots.resize(chartDiv);
-            }} catch (e) {{
+            } catch (e) {
                 console.debug('Resize skipped:', e.message);
-            }}
-        }}
+            }
+        }
         
         // Handle visibility changes - resize charts when page becomes visible
-        document.addEventListener('visibilitychange', () => {{
-            if (!document.hidden) {{
+        document.addEventListener('visibilitychange', () => {
+            if (!document.hidden) {
                 // Wait for browser to restore layout
-                setTimeout(() => {{
-                    document.querySelectorAll('.chart-container > div').forEach(chartDiv => {{
+                setTimeout(() => {
+                    document.querySelectorAll('.chart-container > div').forEach(chartDiv => {
                         if (chartDiv.data) safeResize(chartDiv);
-                    }});
-                }}, 100);
-            }}
-        }});
+                    });
+                }, 100);
+            }
+        });
         
         // Handle window resize with debouncing
         let resizeTimeout;
-        window.addEventListener('resize', () => {{
+        window.addEventListener('resize', () => {
             clearTimeout(resizeTimeout);
-            resizeTimeout = setTimeout(() => {{
-                if (!document.hidden) {{
-                    document.querySelectorAll('.chart-container > div').forEach(chartDiv => {{
+            resizeTimeout = setTimeout(() => {
+                if (!document.hidden) {
+                    document.querySelectorAll('.chart-container > div').forEach(chartDiv => {
                         if (chartDiv.data) safeResize(chartDiv);
-                    }});
-                }}
-            }}, 250);
-        }});
+                    });
+                }
+            }, 250);
+        });
         
-        // Render all charts
-        {chart_scripts}
+        // Render one chart with elegant fixed dimensions
+        function renderChart(divId, figure) {
+            var chartDiv = document.getElementById(divId);
+            
+            if (chartDiv) {
+                // Enable responsive sizing but with safety checks
+                figure.layout.autosize = true;
+                figure.layout.height = 450; // Fixed height to prevent vertical issues
+                delete figure.layout.width; // Let width be responsive
+                
+                // Ensure margins are reasonable
+                if (!figure.layout.margin) {
+                    figure.layout.margin = {};
+                }
+                figure.layout.margin.l = figure.layout.margin.l || 80;
+                figure.layout.margin.r = figure.layout.margin.r || 40;
+                figure.layout.margin.t = figure.layout.margin.t || 100;
+                figure.layout.margin.b = figure.layout.margin.b || 80;
+                
+                // Create the plot
+                Plotly.newPlot(chartDiv, figure.data, figure.layout, config);
+            }
+        }
         
+        // Slice one window out of the shared daily counts and draw it with the shared styles
+        function renderTimeSeries(divId, series, days, title) {
+            const end = new Date(series.end + 'T00:00:00Z');
+            const cutoff = new Date(end.getTime() - days * 86400000).toISOString().slice(0, 10);
+            let start = series.dates.findIndex(date => date > cutoff);
+            if (start < 0) start = series.dates.length;
+            const x = series.dates.slice(start);
+            const y = series.counts.slice(start);
+            const data = [Object.assign({}, series.traces[0], {x: x, y: y})];
+            
+            // 7-day moving average over the days that had reorgs
+            if (x.length > 7 && series.traces.length > 1) {
+                const ma = y.map((_, i) => {
+                    const window = y.slice(Math.max(0, i - 6), i + 1);
+                    return window.reduce((a, b) => a + b, 0) / window.length;
+                });
+                data.push(Object.assign({}, series.traces[1], {x: x, y: ma}));
+            }
+            
+            const layout = JSON.parse(JSON.stringify(series.layout));
+            layout.title.text = '<b>' + title + '</b>';
+            renderChart(divId, {data: data, layout: layout});
+        }
+        
+        // Render all charts
+"""
+
+PAGE_TAIL = """
         // Hide loading overlay once charts are rendered
-        window.addEventListener('load', () => {{
-            setTimeout(() => {{
+        window.addEventListener('load', () => {
+            setTimeout(() => {
                 const overlay = document.getElementById('loadingOverlay');
-                if (overlay) {{
+                if (overlay) {
                     overlay.style.opacity = '0';
                     setTimeout(() => overlay.style.display = 'none', 300);
-                }}
+                }
                 
                 // Initial resize to fit containers after load
-                if (!document.hidden) {{
-                    document.querySelectorAll('.chart-container > div').forEach(chartDiv => {{
+                if (!document.hidden) {
+                    document.querySelectorAll('.chart-container > div').forEach(chartDiv => {
                         if (chartDiv.data) safeResize(chartDiv);
-                    }});
-                }}
-            }}, 100);
-        }});
+                    });
+                }
+            }, 100);
+        });
         
         // Charts now adapt to container width while preventing the collapse bug
     </script>
 </body>
-</html>"""
-    
-    # Generate chart HTML
-    chart_divs = []
-    chart_scripts = []
+</html>
+"""
+
+# Pinned plotly.js: the version bundled with the installed plotly package, as its
+# partial "cartesian" build, which has every trace type used here (scatter, bar, heatmap)
+PLOTLY_JS_VERSION = get_plotlyjs_version()
+PLOTLY_BUNDLE_NAME = f"plotly-cartesian-{PLOTLY_JS_VERSION}.min.js"
+PLOTLY_BUNDLE_URL = f"https://cdn.plot.ly/{PLOTLY_BUNDLE_NAME}"
+# Local copy of the partial bundle, downloaded once so later builds run offline
+PLOTLY_BUNDLE_PATH = os.environ.get("PLOTLY_BUNDLE_PATH", os.path.join("vendor", PLOTLY_BUNDLE_NAME))
+# Bundle file names carry the version, so hosts reading a _headers file may cache them forever
+LONG_CACHE_HEADER = "Cache-Control: public, max-age=31536000, immutable"
+
+# Table rows rendered and written per batch to keep peak memory flat
+TABLE_BATCH_ROWS = 10000
+
+def plotly_bundle():
+    """Return (file name, source) of the pinned plotly.js bundle, preferring the partial build"""
+    if not os.path.exists(PLOTLY_BUNDLE_PATH):
+        try:
+            os.makedirs(os.path.dirname(PLOTLY_BUNDLE_PATH) or ".", exist_ok=True)
+            urlretrieve(PLOTLY_BUNDLE_URL, f"{PLOTLY_BUNDLE_PATH}.tmp")
+            os.replace(f"{PLOTLY_BUNDLE_PATH}.tmp", PLOTLY_BUNDLE_PATH)
+        except OSError as e:
+            print(f"Could not fetch {PLOTLY_BUNDLE_URL} ({e}), using the full bundle shipped with plotly")
+            return f"plotly-{PLOTLY_JS_VERSION}.min.js", get_plotlyjs()
+    with open(PLOTLY_BUNDLE_PATH, encoding='utf-8') as f:
+        return os.path.basename(PLOTLY_BUNDLE_PATH), f.read()
+
+def write_plotly_script(f, plotly_js, output_file):
+    """Write the script tag loading plotly.js from the CDN, a file next to the page, or inline"""
+    if plotly_js == 'cdn':
+        f.write(f'    <script src="{PLOTLY_BUNDLE_URL}"></script>\n')
+        return
+    name, source = plotly_bundle()
+    if plotly_js == 'inline':
+        f.write('    <script>')
+        f.write(source)
+        f.write('</script>\n')
+    elif plotly_js == 'directory':
+        out_dir = os.path.dirname(os.path.abspath(output_file))
+        with open(os.path.join(out_dir, name), 'w', encoding='utf-8') as bundle:
+            bundle.write(source)
+        write_cache_headers(out_dir, f"/{name}")
+        f.write(f'    <script src="{name}"></script>\n')
+    else:
+        raise ValueError(f"Unknown plotly_js mode: {plotly_js}")
+
+def write_cache_headers(out_dir, path):
+    """Add a long-lived Cache-Control rule for path to the _headers file in out_dir"""
+    headers_file = os.path.join(out_dir, "_headers")
+    rule = f"{path}\n  {LONG_CACHE_HEADER}\n"
+    existing = ""
+    if os.path.exists(headers_file):
+        with open(headers_file, encoding='utf-8') as f:
+            existing = f.read()
+    if rule not in existing:
+        with open(headers_file, 'a', encoding='utf-8') as f:
+            f.write(rule)
+
+def render_stats(df, period_label):
+    """Render the stats grid"""
+    # Calculate statistics
+    total_reorgs = len(df)
+    avg_depth = df['depth'].mean() if 'depth' in df.columns else 1.0
+    max_depth = df['depth'].max() if 'depth' in df.columns else 1
+    today = datetime.utcnow().date()
+    reorgs_today = len(df[df['date'].dt.date == today]) if not df.empty else 0
+    reorgs_7d = len(df[df['date'] >= datetime.utcnow() - timedelta(days=7)])
+    reorgs_30d = len(df[df['date'] >= datetime.utcnow() - timedelta(days=30)])
     
-    chart_index = 0
-    for name, fig in charts.items():
-        div_id = f"chart_{chart_index}"
-        chart_divs.append(f'<div class="chart-container" id="{div_id}"></div>')
-        
-        # Convert figure to JSON
-        fig_json = fig.to_json()
+    return f"""        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-value">{total_reorgs}</div>
+                <div class="stat-label">Total Reorgs ({period_label})</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value">{reorgs_today}</div>
+                <div class="stat-label">Today</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value">{reorgs_7d}</div>
+                <div class="stat-label">Last 7 Days</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value">{reorgs_30d}</div>
+                <div class="stat-label">Last 30 Days</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value">{avg_depth:.2f}</div>
+                <div class="stat-label">Avg Depth ({period_label})</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value">{max_depth}</div>
+                <div class="stat-label">Max Depth ({period_label})</div>
+            </div>
+        </div>
         
-        # Create script to render the chart with elegant fixed dimensions
-        script = f"""
-        (function() {{
-            var figure_{chart_index} = {fig_json};
-            var chartDiv = document.getElementById('{div_id}');
-            
-            if (chartDiv) {{
-                // Enable responsive sizing but with safety checks
-                figure_{chart_index}.layout.autosize = true;
-                figure_{chart_index}.layout.height = 450; // Fixed height to prevent vertical issues
-                delete figure_{chart_index}.layout.width; // Let width be responsive
-                
-                // Ensure margins are reasonable
-                if (!figure_{chart_index}.layout.margin) {{
-                    figure_{chart_index}.layout.margin = {{}};
-                }}
-                figure_{chart_index}.layout.margin.l = figure_{chart_index}.layout.margin.l || 80;
-                figure_{chart_index}.layout.margin.r = figure_{chart_index}.layout.margin.r || 40;
-                figure_{chart_index}.layout.margin.t = figure_{chart_index}.layout.margin.t || 100;
-                figure_{chart_index}.layout.margin.b = figure_{chart_index}.layout.margin.b || 80;
-                
-                // Create the plot
-                Plotly.newPlot(chartDiv, figure_{chart_index}.data, figure_{chart_index}.layout, config);
-            }}
-        }})();
-        """
-        chart_scripts.append(script)
-        chart_index += 1
+"""
+
+def render_footer():
+    """Render the footer with the generation time"""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
+    return f"""        <div class="footer">
+            Built with 🖤 by <a href="https://twitter.com/nero_eth" target="_blank">Toni Wahrstätter</a> | 
+            Generated {timestamp} | 
+            Using <a href="https://github.com/nerolation/pyxatu" target="_blank">PyXatu</a> | 
+            Data from <a href="https://ethpandaops.io" target="_blank">EthPandaOps</a>
+        </div>
+    </div>
     
-    # Fill template
-    html = html_template.format(
-        total_reorgs=total_reorgs,
-        reorgs_today=reorgs_today,
-        reorgs_7d=reorgs_7d,
-        reorgs_30d=reorgs_30d,
-        avg_depth=avg_depth,
-        max_depth=max_depth,
-        period_label=period_label,
-        timestamp=datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC'),
-        chart_divs='\n'.join(chart_divs),
-        table_rows=''.join(table_rows),
-        chart_scripts='\n'.join(chart_scripts)
-    )
+"""
+
+def render_table_rows(df_table):
+    """Render table rows with whole-column string operations"""
+    slot = df_table['slot'].astype(str)
+    epoch = df_table['epoch'].astype(str)
+    depth = df_table['depth']
+    depth_class = pd.Series(np.select([depth == 1, depth == 2], ['depth-normal', 'depth-warning'], 'depth-danger'), index=df_table.index)
+    return ('<tr><td><a href="https://beaconcha.in/slot/' + slot + '" target="_blank">' + slot + '</a></td>'
+            + '<td><a href="https://beaconcha.in/epoch/' + epoch + '" target="_blank">' + epoch + '</a></td>'
+            + '<td class="' + depth_class + '">' + depth.astype(str) + '</td>'
+            + '<td>' + df_table['slot_in_epoch'].astype(str) + '</td>'
+            + '<td>' + df_table['date'].dt.strftime('%Y-%m-%d %H:%M:%S UTC') + '</td></tr>\n')
+
+def time_series_payload(daily):
+    """Daily reorg counts plus the trace styles and layout shared by every time series window"""
+    fig = create_time_series_chart(daily)
+    dates, counts = fig.data[0].x, fig.data[0].y
+    fig.update_traces(x=None, y=None)
+    figure = fig.to_plotly_json()
+    return {
+        'end': datetime.utcnow().strftime('%Y-%m-%d'),
+        'dates': list(dates),
+        'counts': [int(count) for count in counts],
+        'traces': figure['data'],
+        'layout': figure['layout'],
+    }
+
+def generate_modern_html_dashboard(charts, df, days_back=90, output_file="reorg_dashboard_modern.html", table_length=100, time_series=(), plotly_js='cdn', daily=None):
+    """Stream a modern, stylish HTML file with all charts to output_file
+
+    time_series is a list of (days, title) windows drawn from one shared
+    daily-count array ahead of the other charts; the counts come from the
+    daily rollup, rolled up from df when none is given. plotly_js picks where the
+    pinned plotly.js bundle is loaded from: 'cdn', 'directory' (a versioned
+    file written next to the page) or 'inline'.
+    """
     
-    # Write to file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+    # Determine period label
+    if days_back >= 365:
+        period_label = f"last {days_back // 365} year{'s' if days_back >= 730 else ''}"
+    elif days_back >= 30:
+        months = days_back // 30
+        period_label = f"last {months} month{'s' if months > 1 else ''}"
+    elif days_back >= 7:
+        weeks = days_back // 7
+        period_label = f"last {weeks} week{'s' if weeks > 1 else ''}"
+    else:
+        period_label = f"last {days_back} day{'s' if days_back > 1 else ''}"
+    
+    # Table data (most recent reorgs first)
+    df_table = df.nlargest(table_length, 'date')
+    
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(PAGE_HEAD)
+        write_plotly_script(f, plotly_js, output_file)
+        f.write(PAGE_STYLE)
+        f.write(render_stats(df, period_label))
+        for chart_index in range(len(time_series) + len(charts)):
+            f.write(f'        <div class="chart-container" id="chart_{chart_index}"></div>\n')
+        
+        f.write('        <div class="table-container">\n')
+        f.write(f'            <div class="table-title">Recent Reorgs (Last {table_length})</div>\n')
+        f.write(TABLE_HEAD)
+        for start in range(0, len(df_table), TABLE_BATCH_ROWS):
+            f.writelines(render_table_rows(df_table.iloc[start:start + TABLE_BATCH_ROWS]))
+        f.write(TABLE_TAIL)
+        f.write(render_footer())
+        
+        # One figure JSON in memory at a time
+        f.write(PAGE_SCRIPTS)
+        if time_series:
+            f.write("        const timeSeries = ")
+            with stage("figure_json") as info:
+                if daily is None:
+                    daily = daily_rollup(df, dimensions=[])
+                payload = json.dumps(time_series_payload(daily), cls=PlotlyJSONEncoder, separators=(',', ':'))
+                info["bytes"] = len(payload)
+            f.write(payload)
+            f.write(";\n")
+            for chart_index, (days, title) in enumerate(time_series):
+                f.write(f"        renderTimeSeries('chart_{chart_index}', timeSeries, {int(days)}, {json.dumps(title)});\n")
+        for chart_index, fig in enumerate(charts.values(), start=len(time_series)):
+            f.write(f"        renderChart('chart_{chart_index}', ")
+            with stage("figure_json") as info:
+                fig_json = fig.to_json()
+                info["bytes"] = len(fig_json)
+            f.write(fig_json)
+            f.write(");\n")
+        f.write(PAGE_TAIL)
+    os.replace(tmp_file, output_file)
     
     print(f"Modern dashboard generated: {output_file}")
 
 def main():
     """Main function to generate the modern dashboard"""
     print("Starting Modern Reorg Dashboard generation...")
+    start_profile()
     
     # Configuration - fetch last 90 days of data
     days_back = 90
     
     # Fetch data
-    df = fetch_reorg_data_pyxatu(days_back=days_back)
+    start_slot = get_current_slot() - days_back * 7200
+    df = fetch_reorg_data_pyxatu(days_back=days_back, start_slot=start_slot)
     
     if df.empty:
         print("No reorg data found!")
+        write_report("reorg-dataprep", os.environ.get("REORG_REPORT", "reorg-dataprep-report.json"))
         return
     
     print(f"Found {len(df)} reorgs")
+    with stage("write_store") as info:
+        write_store(df, PYXATU_STORE)
+        info["rows"], info["bytes"] = len(df), os.path.getsize(PYXATU_STORE)
+    
+    # Reorgs per day; days before this fetch window stay in the rollup store. The
+    # fetch usually starts mid-day, so the merge starts on its first whole day
+    with stage("daily_rollup") as info:
+        first_whole_day = pd.Timestamp(slot_to_time(start_slot)).ceil("D")
+        daily = daily_rollup(df, dimensions=[])
+        daily = merge_rollup(PYXATU_DAILY_STORE, daily, first_whole_day)
+        info["rows"] = len(daily)
     
     # Create charts with appropriate titles
     period_label = "90-Day"
-    charts = {
-        'time_series_90d': create_time_series_chart(df, "90-Day Reorg Trend"),
-        'time_series_30d': create_time_series_chart(df, "30-Day Reorg Trend", period_days=30),
-        'time_series_7d': create_time_series_chart(df, "7-Day Reorg Trend", period_days=7),
-        'slot_position': create_slot_position_chart(df, title="Reorgs by Slot Position in Epoch (Last 90 Days)"),
-        'heatmap': create_heatmap_chart(df),
-        'depth_distribution': create_depth_distribution_chart(df, title="Reorg Depth Distribution (Last 90 Days)"),
-        'epoch_analysis': create_epoch_analysis_chart(df)
+    # The 90/30/7-day trends share one daily-count array and are sliced in the browser
+    time_series = [(days_back, "90-Day Reorg Trend"), (30, "30-Day Reorg Trend"), (7, "7-Day Reorg Trend")]
+    chart_builders = {
+        'slot_position': lambda: create_slot_position_chart(df, title="Reorgs by Slot Position in Epoch (Last 90 Days)"),
+        'heatmap': lambda: create_heatmap_chart(df),
+        'depth_distribution': lambda: create_depth_distribution_chart(df, title="Reorg Depth Distribution (Last 90 Days)"),
+        'epoch_analysis': lambda: create_epoch_analysis_chart(df)
     }
+    charts = {}
+    for name, build in chart_builders.items():
+        with stage(f"chart:{name}"):
+            charts[name] = build()
     
     # Generate HTML
-    generate_modern_html_dashboard(charts, df, days_back, "reorg_dashboard_modern.html")
+    with stage("html_write") as info:
+        generate_modern_html_dashboard(charts, df, days_back, "reorg_dashboard_modern.html", time_series=time_series,
+                                       plotly_js=os.environ.get("PLOTLY_JS", "cdn"), daily=rollup_window(daily, days_back))
+        info["bytes"] = os.path.getsize("reorg_dashboard_modern.html")
     
     print("Modern dashboard generation complete!")
+    write_report("reorg-dataprep", os.environ.get("REORG_REPORT", "reorg-dataprep-report.json"))
 
 if __name__ == "__main__":
     main()
@@ -7,8 +7,11 @@
 from datetime import datetime
 import pandas as pd
 import os
+import sys
 from google.cloud import bigquery
 import re
+from reorg_store import REORG_STORE, REORGERS_STORE, DAILY_STORE, EPOCH_ROLLUP_STORE, ROLLUP_DIMENSIONS, EPOCH_ROLLUP_DIMENSIONS, SLOTS_PER_DAY, SLOTS_PER_EPOCH, GENESIS_TIME, current_slot, slot_to_datetime, clean_text, read_store, merge_increment, daily_rollup, merge_rollup, read_watermark, write_watermark
+from reorg_snapshot import build_snapshot, write_snapshot
 
 
 # In[2]:
@@ -29,22 +32,32 @@ set_google_credentials("./config/","google-creds.json")
 # In[3]:
 
 
-def slot_to_time(slot):
-    timestamp = 1606824023 + slot * 12
-    dt_object = datetime.utcfromtimestamp(timestamp)
-    formatted_time = dt_object.strftime("%Y-%m-%d %H:%M:%S")
-    return formatted_time
+# Whole-column transforms: datetime arithmetic from genesis, integer modulo and
+# a translate table applied once per distinct builder name
+def add_slot_columns(df):
+    df["date"] = slot_to_datetime(df["slot"])
+    df["slot_in_epoch"] = df["slot"] % SLOTS_PER_EPOCH
+    df["builder"] = clean_text(df["builder"])
+    return df
 
-def slot_in_epoch(slot):
-    return slot%32
-    
-def add_link_to_slot(slot):
-    return f'[{slot}](https://beaconcha.in/slot/{slot})'
 
-def clean_data(text):
-    if isinstance(text, str):
-        return re.sub(r'[^\x20-\x7E]', '', text)
-    return text
+# In[ ]:
+
+
+# Incremental mode: only slots after the stored watermark are fetched and merged
+# into the local stores; `--full` re-pulls the whole retention window.
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", 90))
+# Re-pull one day behind the watermark to pick up late blockprint/mev-boost rows
+OVERLAP_SLOTS = SLOTS_PER_DAY
+LEADERBOARD_STORE = "leaderboard-daily.parquet"
+
+watermark = None if "--full" in sys.argv else read_watermark()
+if watermark is None:
+    start_slot = current_slot() - RETENTION_DAYS * SLOTS_PER_DAY
+else:
+    start_slot = watermark - OVERLAP_SLOTS
+start_day = datetime.utcfromtimestamp(GENESIS_TIME + start_slot * 12).strftime("%Y-%m-%d")
+print(f"{'full' if watermark is None else 'incremental'} refresh from slot {start_slot} ({start_day})")
 
 
 # In[ ]:
@@ -76,18 +89,38 @@ ORDER BY slot desc;"""
 #ORDER BY slot desc;"""
 def remove_duplicates():
     print("removing duplicates...")
-    client.query(query)
+    client.query(query).result()
     print("duplicates removed.")
+
+# Incremental counterpart: only fill the slot gaps after the watermark instead
+# of rewriting the whole table
+fill_query = f"""INSERT INTO `ethereum-data-nero.ethdata.beaconchain_pace` (slot, parent_slot, cl_client, validator_id)
+SELECT slot_nr, 0, "Unknown", 0
+FROM (
+    SELECT MAX(slot) AS _end
+    FROM `ethereum-data-nero.ethdata.beaconchain_pace`
+), UNNEST(GENERATE_ARRAY({start_slot} + 1, _end)) AS slot_nr
+WHERE slot_nr NOT IN (
+    SELECT slot FROM `ethereum-data-nero.ethdata.beaconchain_pace` WHERE slot > {start_slot}
+);"""
+def fill_missing_slots():
+    print("filling missing slots...")
+    client.query(fill_query).result()
+    print("missing slots filled.")
     
     
 client = bigquery.Client()
-remove_duplicates()
+if watermark is None:
+    remove_duplicates()
+else:
+    fill_missing_slots()
+new_watermark = pd.read_gbq("SELECT MAX(slot) AS slot FROM `ethereum-data-nero.ethdata.beaconchain_pace`")["slot"][0]
 
 
 # In[34]:
 
 
-query = """
+query = f"""
     SELECT
       DISTINCT 
           AA.slot, AA.parent_slot, AA.cl_client, AA.validator_id, 
@@ -99,34 +132,28 @@ query = """
     FROM
       `ethereum-data-nero.ethdata.beaconchain_pace`
     WHERE
-      slot IN (
+      slot > {start_slot}
+      AND slot IN (
       SELECT
         slot
       FROM
         `ethereum-data-nero.ethdata.beaconchain`
       WHERE
         cl_client= "missed"
+        AND slot > {start_slot}
         )
     ) AA LEFT JOIN (
-      SELECT DISTINCT slot, relay, builder, validator FROM `ethereum-data-nero.eth.mevboost_db` WHERE DATE(date) between DATE_SUB(current_date(), INTERVAL 90 DAY) and DATE_Add(current_date(), INTERVAL 1 DAY)
+      SELECT DISTINCT slot, relay, builder, validator FROM `ethereum-data-nero.eth.mevboost_db` WHERE DATE(date) between DATE('{start_day}') and DATE_Add(current_date(), INTERVAL 1 DAY) AND slot > {start_slot}
     ) BB on AA.slot = BB.slot
     ORDER BY slot
 """
-df = pd.read_gbq(query)
-df["date"] = df["slot"].apply(slot_to_time)
-df["slot_in_epoch"] = df["slot"].apply(slot_in_epoch)
-df["parent_slot"] = df.apply(
-    lambda x: str(x["parent_slot"]) + " (" + str(x["parent_slot"] - x["slot"]) + ")" if x["parent_slot"] != 0 else 0, 
-    axis=1
-)
-df["slot"] = df["slot"].apply(add_link_to_slot)
-df['builder'] = df['builder'].apply(clean_data)
+df = add_slot_columns(pd.read_gbq(query))
 
 
 # In[33]:
 
 
-query = """
+query = f"""
   SELECT
   DISTINCT AA.slot,
   AA.validator_id,
@@ -140,13 +167,15 @@ FROM (
   FROM
     `ethereum-data-nero.ethdata.beaconchain_pace`
   WHERE
-    slot IN (
+    slot > {start_slot}
+    AND slot IN (
     SELECT
       slot
     FROM
       `ethereum-data-nero.ethdata.beaconchain`
     WHERE
-      cl_client= "missed" ) ) AA
+      cl_client= "missed"
+      AND slot > {start_slot} ) ) AA
 LEFT JOIN (
   SELECT
     DD.*,
@@ -160,14 +189,17 @@ LEFT JOIN (
     FROM
       `ethereum-data-nero.eth.mevboost_db`
     WHERE
-      DATE(date) BETWEEN DATE_SUB(CURRENT_DATE(), INTERVAL 90 DAY)
-      AND CURRENT_DATE()) DD
+      DATE(date) BETWEEN DATE('{start_day}')
+      AND CURRENT_DATE()
+      AND slot > {start_slot}) DD
   LEFT JOIN (
     SELECT
       slot,
       cl_client
     FROM
-      `ethereum-data-nero.ethdata.beaconchain_pace`)CC
+      `ethereum-data-nero.ethdata.beaconchain_pace`
+    WHERE
+      slot > {start_slot})CC
   ON
     DD.slot = CC.slot ) BB
 ON
@@ -176,39 +208,107 @@ ORDER BY
   slot
     """
 import re
-df_reorg = pd.read_gbq(query)
-df_reorg["date"] = df_reorg["slot"].apply(slot_to_time)
-df_reorg["slot_in_epoch"] = df_reorg["slot"].apply(slot_in_epoch)
-df_reorg["slot"] = df_reorg["slot"].apply(add_link_to_slot)
+df_reorg = add_slot_columns(pd.read_gbq(query))
 
+df_reorg
 
 
-df_reorg['builder'] = df_reorg['builder'].apply(clean_data)
-df_reorg.to_csv("reorgers-data.csv", index=None)
+# In[36]:
 
-df_reorg
 
+# Slots stay integers here; links and parent-slot labels are rendered by the app.
+# Raw rows expire after RETENTION_DAYS, so before the first rollup the whole local
+# history is kept aside to seed the rollup stores with it
+history = None
+if os.path.exists(REORG_STORE) and not (os.path.exists(DAILY_STORE) and os.path.exists(EPOCH_ROLLUP_STORE)):
+    history = read_store(REORG_STORE)
+df_store = merge_increment(REORG_STORE, df, start_slot, RETENTION_DAYS)
+merge_increment(REORGERS_STORE, df_reorg, start_slot, RETENTION_DAYS)
 
-# In[36]:
 
+# In[ ]:
 
-df.to_csv("reorg-data.csv", index=None)
-df_reorg.to_csv("reorgers-data.csv", index=None)
 
-df2 = pd.read_gbq('SELECT DISTINCT validator, count(Distinct slot) slots FROM `ethereum-data-nero.eth.mevboost_db` WHERE validator is not null and DATE(date) between DATE_SUB(current_date(), INTERVAL 90 DAY) and current_date() group by validator order by slots desc limit 10')
-df3 = pd.read_gbq('SELECT DISTINCT relay, count(Distinct slot) slots FROM `ethereum-data-nero.eth.mevboost_db` WHERE relay is not null and DATE(date) between DATE_SUB(current_date(), INTERVAL 90 DAY) and current_date() group by relay order by slots desc limit 10')
-df4 = pd.read_gbq('SELECT DISTINCT builder, count(Distinct slot) slots FROM `ethereum-data-nero.eth.mevboost_db` WHERE builder is not null and DATE(date) between DATE_SUB(current_date(), INTERVAL 90 DAY) and current_date() group by builder order by slots desc limit 10')
+# Leaderboards: per-day distinct-slot counts are additive, so only the days
+# after the watermark are queried and the top lists are summed locally
+first_slot_of_day = (int(pd.Timestamp(start_day).timestamp()) - GENESIS_TIME) // 12
+leaderboard_query = " UNION ALL ".join(
+    f"""SELECT DATE(date) AS day, '{entity}' AS entity, {entity} AS name, count(DISTINCT slot) AS slots
+    FROM `ethereum-data-nero.eth.mevboost_db`
+    WHERE {entity} IS NOT NULL AND DATE(date) BETWEEN DATE('{start_day}') AND current_date()
+    GROUP BY day, name"""
+    for entity in ("validator", "relay", "builder")
+) + f""" UNION ALL
+    SELECT DATE(TIMESTAMP_SECONDS({GENESIS_TIME} + slot * 12)) AS day, 'cl_client' AS entity, cl_client AS name, count(DISTINCT slot) AS slots
+    FROM `ethereum-data-nero.ethdata.beaconchain_pace`
+    WHERE slot >= {first_slot_of_day}
+    GROUP BY day, name"""
+daily = pd.read_gbq(leaderboard_query)
+daily["day"] = pd.to_datetime(daily["day"])
+if watermark is not None and os.path.exists(LEADERBOARD_STORE):
+    old_daily = pd.read_parquet(LEADERBOARD_STORE)
+    daily = pd.concat([old_daily[old_daily["day"] < start_day], daily], ignore_index=True)
+today = pd.Timestamp(datetime.utcnow().date())
+daily = daily[daily["day"] >= today - pd.Timedelta(days=max(RETENTION_DAYS, 90))]
+daily.to_parquet(LEADERBOARD_STORE, index=False)
+
+def top_slots(entity, days, limit=None, whole_days=False):
+    recent = daily[(daily["entity"] == entity) & (daily["day"] >= today - pd.Timedelta(days=days))]
+    if whole_days:
+        # Exactly `days` complete days, days * SLOTS_PER_DAY slots, without today's partial day
+        recent = recent[recent["day"] < today]
+    top = recent.groupby("name")["slots"].sum().sort_values(ascending=False).head(limit).reset_index()
+    top.columns = [entity, "slots"]
+    return top
+
+df2 = top_slots("validator", 90, 10)
+df3 = top_slots("relay", 90, 10)
+df4 = top_slots("builder", 90, 10)
 df2.to_csv("validator_slots.csv", index=None)
 df3.to_csv("relay_slots.csv", index=None)
 df4.to_csv("builder_slots.csv", index=None)
-df5 = pd.read_gbq('''SELECT DISTINCT cl_client, count(cl_client) slots FROM 
-(SELECT cl_client, slot FROM `ethereum-data-nero.ethdata.beaconchain_pace` order by slot desc limit 216000)
-group by cl_client
-order by slots desc
-''')
+df5 = top_slots("cl_client", 30, whole_days=True)
 df5.to_csv("clclient_slots.csv", index=None)
 
 
+# In[ ]:
+
+
+# Daily rollup cubes: reorged and proposed slots per day, client, builder and
+# relay for the time-series figures, reorged slots per day, client and slot in
+# epoch for the long fig3 windows. Days from start_day on are recomputed; without
+# a cube yet, the whole local history is rolled up. Retention pruning cuts the
+# local rows mid-day, so the merge never starts before their first whole day.
+# Rows older than ROLLUP_DAILY_DAYS are folded into weekly rows.
+rollup_rows = df_store if history is None else pd.concat([history[history["slot"] < df_store["slot"].min()], df_store], ignore_index=True)
+first_whole_day = (rollup_rows["date"].min().normalize() + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+rollup_day = max(start_day, first_whole_day) if history is None else first_whole_day
+rollup_rows = rollup_rows[rollup_rows["date"] >= rollup_day]
+rollup_first_slot = (int(pd.Timestamp(rollup_day).timestamp()) - GENESIS_TIME) // 12
+proposed_query = f"""SELECT day, cl_client, builder, relay, count(*) AS slots FROM (
+    SELECT DATE(TIMESTAMP_SECONDS({GENESIS_TIME} + P.slot * 12)) AS day, P.cl_client,
+        IFNULL(M.builder, "Unknown") AS builder, IFNULL(M.relay, "Unknown") AS relay
+    FROM (
+        SELECT DISTINCT slot, cl_client FROM `ethereum-data-nero.ethdata.beaconchain_pace` WHERE slot >= {rollup_first_slot}
+    ) P LEFT JOIN (
+        SELECT slot, MIN(builder) AS builder, MIN(relay) AS relay FROM `ethereum-data-nero.eth.mevboost_db`
+        WHERE DATE(date) >= DATE('{rollup_day}') GROUP BY slot
+    ) M ON P.slot = M.slot
+)
+GROUP BY day, cl_client, builder, relay"""
+proposed = pd.read_gbq(proposed_query)
+proposed["day"] = pd.to_datetime(proposed["day"])
+proposed["builder"] = clean_text(proposed["builder"])
+proposed = proposed.groupby(["day", *ROLLUP_DIMENSIONS], as_index=False)["slots"].sum()
+reorged = daily_rollup(rollup_rows)
+merge_rollup(DAILY_STORE, reorged.merge(proposed, how="outer", on=["day", *ROLLUP_DIMENSIONS]), rollup_day)
+merge_rollup(EPOCH_ROLLUP_STORE, daily_rollup(rollup_rows, EPOCH_ROLLUP_DIMENSIONS), rollup_day)
+
+# Only advance the watermark once every local store has been merged
+write_watermark(new_watermark)
+
+# Prebuild the dashboard snapshot so the app workers only memory-map it
+write_snapshot(build_snapshot())
 
 print("finished")
 
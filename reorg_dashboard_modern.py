@@ -8,6 +8,7 @@ from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 from pyxatu import PyXatu
 import json
+from pyxatu_cache import range_query, range_missed_slots
 
 # Modern color palette
 COLORS = {
@@ -51,20 +52,21 @@ def fetch_reorg_data_pyxatu(days_back=90):
     
     with PyXatu() as xatu:
         # Query for reorgs - get all reports and we'll take minimum depth per slot
-        reorg_query = f"""
+        # {lo}/{hi} are filled in per day block so finalized days come from the cache
+        reorg_query = """
         SELECT 
             slot - depth as slot,
             depth,
             slot as reorg_slot
         FROM beacon_api_eth_v1_events_chain_reorg
-        WHERE slot BETWEEN {start_slot} AND {current_slot}
+        WHERE slot >= {lo} AND slot < {hi}
             AND meta_network_name = 'mainnet'
             AND meta_client_implementation != 'Contributoor'
         ORDER BY slot DESC
         """
         
         print("Querying reorgs...")
-        reorgs_raw = xatu.raw_query(reorg_query)
+        reorgs_raw = range_query(xatu, reorg_query, start_slot, current_slot + 1)
         
        # Group by slot and take MINIMUM depth to avoid false positives
         print("Processing reorgs - taking minimum depth per slot...")
@@ -75,7 +77,7 @@ def fetch_reorg_data_pyxatu(days_back=90):
         
         # Get missed slots
         print("Getting missed slots...")
-        missed_slots = xatu.get_missed_slots(slot_range=[start_slot, current_slot])
+        missed_slots = range_missed_slots(xatu, start_slot, current_slot + 1)
         
         # Filter reorgs to only those at missed slots
         reorgs_df = reorgs_df[reorgs_df["slot"].isin(missed_slots)]
@@ -0,0 +1,999 @@
+#!/usr/bin/env python3
+# Data preparation and Plotly figures for the reorg.pics dashboard
+#
+# Pure pandas/Plotly code with no Dash dependency, so the ETL can build the
+# dashboard snapshot without starting the web app.
+
+import re
+import plotly.express as px
+import plotly.graph_objects as go
+import pandas as pd
+import numpy as np
+from plotly.subplots import make_subplots
+from reorg_store import REORG_STORE, REORGERS_STORE, EPOCH_ROLLUP_STORE, EPOCH_ROLLUP_DIMENSIONS, WINDOW_DAYS, read_recent, read_rollup, rollup_window, window_slices, slot_in_epoch_counts, rollup_slot_in_epoch_counts, slot_links, parent_slot_labels
+
+clclientorder = ["Lighthouse", "Prysm", "Nimbus", "Teku", "Lodestar"]
+# Axes of the slot-in-epoch count matrix; windows in the order of the chart dropdown.
+# All time (None) and 1 year come from the daily rollup, the rest from raw slot rows
+SIE_ROLLUP_DAYS = (None, 365)
+SIE_WINDOW_DAYS = (60, 30, 14, 7)
+SIE_CLIENTS = tuple(clclientorder)
+
+
+def exclude_clients_not_shown(df):
+    _clients = df["cl_client"].unique()
+    _clclientorder = clclientorder
+    for i in clclientorder:
+        if i not in _clients:
+            _clclientorder.remove(i)
+    return _clclientorder
+
+def orderclclient(df):
+    _clientorder = exclude_clients_not_shown(df)
+    df.set_index("cl_client", inplace=True)
+    df = df.loc[_clientorder]
+    return df.reset_index()
+
+
+def render_table(df):
+    # Links and parent-slot labels are only materialized for the table rows
+    df_table = df.assign(
+        slot=slot_links(df["slot"]),
+        parent_slot=parent_slot_labels(df["parent_slot"], df["slot"]),
+        date=df["date"].dt.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+    df_table = df_table.rename(columns={"slot": "Slot", "parent_slot": "Parent Slot", "cl_client": "CL Client", "validator_id": "Val. ID", "date": "Date", "slot_in_epoch": "Slot Nr. in Epoch"})
+    df_table.sort_values("Date", ascending=False, inplace=True)
+    df_table = df_table[["Slot", "Parent Slot", "CL Client", "Val. ID", "Date", "Slot Nr. in Epoch"]].drop_duplicates()
+    df_table["Slot Nr. in Epoch"] = df_table["Slot Nr. in Epoch"].astype(int)
+    df_table["Val. ID"] = df_table["Val. ID"].astype(int)
+    df_table["Parent Slot"] = df_table["Parent Slot"].astype(str)
+    return df_table
+
+
+# Data preparation
+def prepare_data():
+    # Only the raw rows of the widest window are read; longer ranges come from the rollups
+    df = read_recent(REORG_STORE, max(WINDOW_DAYS)).replace("Unknown", "Unknown/missed")
+    #df = df[~df['cl_client'].str.contains('Unknown')]
+    df2 = pd.read_csv("validator_slots.csv").replace("Unknown", "Unknown/missed")
+    #df2 = df2[~df2['validator'].str.contains('Unknown')]
+    df3 = pd.read_csv("relay_slots.csv").replace("Unknown", "Unknown/missed")
+    #df3 = df3[~df3['relay'].str.contains('Unknown')]
+    df4 = pd.read_csv("builder_slots.csv").replace("Unknown", "Unknown/missed")
+    #df4 = df4[~df4['builder'].str.contains('Unknown')]
+    df5 = pd.read_csv("clclient_slots.csv").replace("Unknown", "Unknown/missed")
+    #df5 = df5[~df5['cl_client'].str.contains('Unknown')]
+    
+    def clean_data(text):
+        if isinstance(text, str):
+            return re.sub(r'[^\x20-\x7E]', '', text)
+        return text
+    
+    df4['builder'] = df4['builder'].apply(clean_data)
+
+    dfreorger = window_slices(read_recent(REORGERS_STORE, 60), days=(60,))[60]
+    
+    # Sorted once by slot; every window is a tail slice of the same frame
+    df_table = render_table(window_slices(df, days=(30,))[30])
+    windows = window_slices(df.drop("parent_slot", axis=1))
+    df_90, df_60, df_30, df_14, df_7 = (windows[d] for d in WINDOW_DAYS)
+    
+    # Every window counts distinct reorged slots per client, as the rollup does,
+    # not one row per relay
+    sie_counts = np.concatenate([
+        rollup_slot_in_epoch_counts(read_rollup(EPOCH_ROLLUP_STORE, EPOCH_ROLLUP_DIMENSIONS), SIE_CLIENTS, SIE_ROLLUP_DAYS),
+        slot_in_epoch_counts(df_60.drop_duplicates(["slot", "cl_client"]), SIE_CLIENTS, SIE_WINDOW_DAYS),
+    ])
+    # Day x client x builder x relay counts written by the ETL; the time series read only these
+    daily = read_rollup()
+
+    return df_90, df_60, df_30, df_14, df_7, df_table, sie_counts, df2, df3, df4, df5, dfreorger, daily
+
+def fig3_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 18
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Reorged Slot Nr. in Epoch</span>',
+        xaxis_title='Slot',
+        margin=dict(l=20, r=20, t=40, b=20),
+        font=dict(family="Ubuntu Mono", size = font_size),
+        barmode='stack',
+        hovermode="x unified",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        legend=dict(
+            x=1,           # x position of the legend (1 corresponds to the right end of the plot)
+            y=1,           # y position of the legend (1 corresponds to the top of the plot)
+            xanchor="auto",  # x anchor of the legend
+            yanchor="auto",  # y anchor of the legend
+            bgcolor="rgba(255, 255, 255, 0.5)" # You can set a background color for readability if needed
+        ),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,
+            tickvals=list(range(32))     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        updatemenus=[dict(
+            buttons=[
+                dict(args=[{"visible": [True if i %6==0 else False for i in range(30)]},
+                           {}],
+                    label="All time",
+                    method="update"
+                )
+                ,
+                dict(args=[{"visible": [True if i %6==1 else False for i in range(30)]},
+                           {}],
+                    label="1 year",
+                    method="update"
+                )
+                ,
+                dict(args=[{"visible": [True if i %6==2 else False for i in range(30)]},
+                           {}],
+                    label="60 days",
+                    method="update"
+                )
+                ,
+                dict(args=[{"visible": [True if i %6==3 else False for i in range(30)]},
+                               {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Slot Nr. Reorged in Epoch</span>',}],
+                        label="30 days",
+                        method="update"
+                ),
+                dict(args=[{"visible": [True if i %6==4 else False for i in range(30)]},
+                           {}],
+                    label="14 days",
+                    method="update"
+                )
+                ,
+                dict(args=[{"visible": [True if i %6==5 else False for i in range(30)]},
+                               {}],
+                        label="7 days",
+                        method="update"
+                )
+                ],
+            showactive= True,
+            direction= 'down',
+            active= 2,
+            x= 1.0, 
+            xanchor= 'right', 
+            y= 1.15, 
+            yanchor= 'top'
+        )]
+    )
+
+def create_fig3(sie_counts):
+    fig = make_subplots(rows=1, cols=1)
+
+    # Colors array (can be extended with more colors)
+    colors = [
+        '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+        '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
+    ]
+
+    # Add traces for each client, one per window; slots without reorgs get no bar
+    for i, client in enumerate(clclientorder):
+        for w in range(len(sie_counts)):
+            counts = sie_counts[w, SIE_CLIENTS.index(client)]
+            slots = np.flatnonzero(counts)
+            fig.add_trace(go.Bar(x=slots.tolist(), y=counts[slots].tolist(), name=client, marker_color=colors[i], visible=w == len(SIE_ROLLUP_DAYS),hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>'))
+
+    fig.update_layout(**fig3_layout())
+    fig.update_yaxes(title_standoff=5)
+    return fig
+
+def fig2_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 18
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per CL Client<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+        xaxis_title='%',
+        yaxis_title='Client',
+        hovermode = "closest",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        margin=dict(l=20, r=20, t=80, b=20),
+        font=dict(family="Ubuntu Mono", size = font_size),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        updatemenus=[dict(
+            type="buttons",
+            buttons=[
+                dict(args=[{"visible": [True]*5+5*[False]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Client<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            # "height":500,
+                            "xaxis.title": "%",
+                            #"annotations": k
+                           }],
+                    label="Relative",
+                    method="update"
+                )
+                ,
+                dict(args=[{"visible": [False]*5+5*[True]},
+                               {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absulute Nr. of Reorged Slots per Client<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                                # "height":500,
+                                "xaxis.title": "slots",
+                                #"annotations": k
+                               }],
+                        label="Absolute",
+                        method="update"
+                )
+                ],
+            showactive= True,
+            direction= 'left',
+            active= 0,
+            x= 1.0, 
+            xanchor= 'right', 
+            y= 1.15, 
+            yanchor= 'top'
+        )]   
+    )
+
+
+def create_fig2(df_90, df, df_30, df_14, df_7, order):
+    df = df.drop("relay", axis=1).drop_duplicates()
+    df = df[~df['cl_client'].str.contains('missed')]
+    _df = df['cl_client'].value_counts().reset_index()
+    _df.columns = ["cl_client", "count"]
+ 
+    _df = pd.merge(_df,order,how="left", left_on="cl_client", right_on="cl_client")
+    _df["cl_client"]= _df["cl_client"].apply(lambda x: x[0].upper()+x[1:])
+    _df.columns = ['cl_client', 'count', 'slots']
+    _df["relative_count"] = round(_df['count'] / _df['slots'] * 100, 5)
+    _df.sort_values("relative_count", ascending=False, inplace=True)
+    fig2 = make_subplots(rows=1, cols=1)
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+    _df = orderclclient(_df)
+    for index, row in _df.iterrows():
+        client = row['cl_client']
+        relative_count = row['relative_count']
+        color = colors[index % len(colors)]
+
+        fig2.add_trace(
+            go.Bar(
+                x=[relative_count], 
+                y=[client], 
+                orientation='h', 
+                marker=dict(color=color),
+                hovertemplate=f'<b>{client}: {relative_count}</b><extra></extra>',
+                showlegend=False
+            )
+        )
+
+    # Create the absolute bars
+    for index, row in _df.iterrows():
+        client = row['cl_client']
+        count = row['count']
+        color = colors[index % len(colors)]
+
+        fig2.add_trace(
+            go.Bar(
+                x=[count], 
+                y=[client], 
+                orientation='h', 
+                marker=dict(color=color), 
+                visible=False,
+                hovertemplate=f'<b>{client}: {count}</b><extra></extra>',
+                showlegend=False
+            )
+        )
+    fig2.update_layout(**fig2_layout())
+    fig2.update_yaxes(title_standoff=5)
+    return fig2
+
+def fig1_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 20
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Number of Reorged Blocks Over Time</span>',
+        xaxis_title='Date',
+        yaxis_title='#Blocks',
+        margin=dict(l=20, r=20, t=40, b=20),
+        font=dict(family="Ubuntu Mono", size = font_size),
+        hovermode = "x unified",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        legend=dict(
+            x=0,           # x position of the legend (1 corresponds to the right end of the plot)
+            y=1,           # y position of the legend (1 corresponds to the top of the plot)
+            xanchor="auto",  # x anchor of the legend
+            yanchor="auto",  # y anchor of the legend
+            bgcolor="rgba(255, 255, 255, 0.7)" # You can set a background color for readability if needed
+        ),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        updatemenus=[dict(
+            type="buttons",
+            buttons=[
+                dict(args=[{"visible": [True if i%2==0 else False for i in range(10)]},
+                           {}],
+                    label="Absolute",
+                    method="update"
+                )
+                ,
+                dict(args=[{"visible": [True if i%2==1 else False for i in range(10)]},
+                               {}],
+                        label="Relative",
+                        method="update"
+                )
+                ],
+            showactive= True,
+            direction= 'left',
+            active= 0,
+            x= 1.0, 
+            xanchor= 'right', 
+            y= 1.15, 
+            yanchor= 'top'
+        )]
+    )
+
+def daily_client_counts(daily, days):
+    """Reorged slots per day and client over the last `days` days of the rollup"""
+    df = rollup_window(daily, days)
+    df = df[(df["cl_client"] != "missed") & (df["reorgs"] > 0)]
+    df = df.groupby(["day", "cl_client"], observed=True)["reorgs"].sum().reset_index()
+    return pd.DataFrame({"date": df["day"].dt.strftime("%Y-%m-%d"), "cl_client": df["cl_client"], "slot": df["reorgs"]})
+
+def create_fig1(daily):
+    fig1 = make_subplots(rows=1, cols=1)
+    grouped_data = daily_client_counts(daily, 30)
+    ordering = grouped_data.groupby("cl_client", observed=True)["slot"].count().index.sort_values().values.tolist()
+    grouped_data.set_index("cl_client", inplace=True)
+    grouped_data = grouped_data.loc[ordering].reset_index()
+    # Per-date share of each client, computed in one grouped pass
+    grouped_data["relative_count"] = grouped_data["slot"] / grouped_data.groupby("date")["slot"].transform("sum")
+
+    colors = [
+        '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+        '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
+    ]
+    color_mapping = {client: color for client, color in zip(clclientorder, colors)}
+
+    grouped_data = orderclclient(grouped_data)
+    for client in grouped_data['cl_client'].unique():
+        client_data = grouped_data[grouped_data['cl_client'] == client]
+        visibility = "legendonly" if "missed" in client else True
+        
+        fig1.add_trace(
+            go.Scatter(x=client_data['date'], y=client_data['slot'], mode='lines', name=client, stackgroup='A', visible=visibility, hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>', line=dict(color=color_mapping[client]))
+        )
+        fig1.add_trace(
+            go.Scatter(x=client_data['date'], y=client_data['relative_count'], mode='lines', name=client, stackgroup='B', visible=False, hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>', line=dict(color=color_mapping[client]))
+        )
+        
+
+    fig1.update_layout(**fig1_layout())
+    fig1.update_yaxes(title_standoff=5)
+    return fig1
+
+# Leaderboard bar charts (figures 4, 5, 6, 8, 9 and 10)
+LEADERBOARD_COLORS = ['#1f77b4','#ff7f0e','#2ca02c','#d62728','#9467bd','#8c564b','#e377c2','#7f7f7f','#bcbd22','#17becf']
+
+
+def capitalize_first(names):
+    """Upper-case the first letter of every name"""
+    return names.str[:1].str.upper() + names.str[1:]
+
+
+def shorten_keys(names):
+    """Cut 0x-prefixed keys down to their first 7 hex digits"""
+    return names.where(~names.str.startswith("0x"), names.str[:9] + "...")
+
+
+def leaderboard(df, column, order, top):
+    """Reorged slots per entity, absolute and relative to its proposed slots, best rate first"""
+    if column != "relay":
+        # Rows are per (slot, relay); count every other entity once per slot
+        df = df.drop_duplicates(subset=[c for c in df.columns if c != "relay"])
+    counts = df.loc[df[column] != "missed", column].value_counts()
+    board = pd.DataFrame({column: capitalize_first(counts.index.astype(str).to_series(index=range(len(counts)))),
+                          "count": counts.to_numpy()})
+    slots = order.assign(**{column: capitalize_first(order[column].astype(str))}).drop_duplicates(column).set_index(column)["slots"]
+    board["slots"] = board[column].map(slots)
+    board["relative_count"] = (board["count"] / board["slots"] * 100).round(5)
+    board = board[board["count"] > 0]
+    board[column] = shorten_keys(board[column])
+    return board.sort_values("relative_count", ascending=False).iloc[0:top]
+
+
+def leaderboard_figure(board, column, layout):
+    """Relative and absolute bars of a leaderboard, one trace each; the layout buttons toggle them"""
+    colors = [LEADERBOARD_COLORS[i % len(LEADERBOARD_COLORS)] for i in board.index]
+    names = board[column].tolist()
+    fig = make_subplots(rows=1, cols=1)
+    for values, visible in ((board["relative_count"], True), (board["count"], False)):
+        fig.add_trace(
+            go.Bar(
+                x=values.tolist(),
+                y=names,
+                orientation='h',
+                marker=dict(color=colors),
+                visible=visible,
+                hovertemplate='<b>%{y}: %{x}</b><extra></extra>',
+                showlegend=False
+            )
+        )
+    fig.update_layout(**layout)
+    fig.update_yaxes(title_standoff=5)
+    return fig
+
+
+def fig4_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 20
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+        xaxis_title='%',
+        yaxis_title='Validator',
+        margin=dict(l=20, r=20, t=80, b=20),
+        font=dict(family="Ubuntu Mono", size=font_size),
+        hovermode = "closest",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        updatemenus=[dict(
+            type="buttons",
+            buttons=[
+                dict(args=[{"visible": [True, False]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "%",
+                           }],
+                    label="Relative",
+                    method="update"
+                ),
+                dict(args=[{"visible":  [False, True]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "slots",
+                           }],
+                    label="Absolute",
+                    method="update"
+                )
+            ],
+            showactive=True,
+            direction='left',
+            active=0,
+            x=1.0,
+            xanchor='right',
+            y=1.15,
+            yanchor='top'
+        )]
+    )
+
+
+def create_fig_for_validators(df_90, df, df_30, df_14, df_7, order):
+    return leaderboard_figure(leaderboard(df, "validator", order, 12), "validator", fig4_layout())
+
+def fig5_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 20
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+        xaxis_title='%',
+        yaxis_title='Relay',
+        margin=dict(l=20, r=20, t=80, b=20),
+        font=dict(family="Ubuntu Mono", size=font_size),
+        hovermode = "closest",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        updatemenus=[dict(
+            type="buttons",
+            buttons=[
+                dict(args=[{"visible": [True, False]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "%",
+                           }],
+                    label="Relative",
+                    method="update"
+                ),
+                dict(args=[{"visible": [False, True]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "slots",
+                           }],
+                    label="Absolute",
+                    method="update"
+                )
+            ],
+            showactive=True,
+            direction='left',
+            active=0,
+            x=1.0,
+            xanchor='right',
+            y=1.15,
+            yanchor='top'
+        )]
+    )
+
+def create_fig_for_relays(df_90, df, df_30, df_14, df_7, order):
+    return leaderboard_figure(leaderboard(df, "relay", order, 11), "relay", fig5_layout())
+
+
+
+
+
+
+def create_reorger_builder_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 20
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+        xaxis_title='%',
+        yaxis_title='Builder',
+        margin=dict(l=20, r=20, t=80, b=20),
+        font=dict(family="Ubuntu Mono", size=font_size),
+        hovermode = "closest",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        paper_bgcolor= "#eee",
+        updatemenus=[dict(
+            type="buttons",
+            buttons=[
+                dict(args=[{"visible": [True, False]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "%",
+                           }],
+                    label="Relative",
+                    method="update"
+                ),
+                dict(args=[{"visible":[False, True]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Slots by Reorging Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "slots",
+                           }],
+                    label="Absolute",
+                    method="update"
+                )
+            ],
+            showactive=True,
+            direction='left',
+            active=0,
+            x=1.0,
+            xanchor='right',
+            y=1.15,
+            yanchor='top'
+        )]
+    )
+
+def create_reorger_builder(df_90, df_60, df_30, df_14, df_7, order, df):
+    return leaderboard_figure(leaderboard(df, "builder", order, 12), "builder", create_reorger_builder_layout())
+
+
+
+
+
+
+def create_reorger_validator_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 20
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+        xaxis_title='%',
+        yaxis_title='Validator',
+        margin=dict(l=20, r=20, t=80, b=20),
+        font=dict(family="Ubuntu Mono", size=font_size),
+        hovermode = "closest",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        paper_bgcolor= "#eee",
+        updatemenus=[dict(
+            type = "buttons",
+            direction = "left",
+
+            buttons=[
+                dict(args=[{"visible": [True, False]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Validator<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "%",
+                           }],
+                    label="Relative",
+                    method="update"
+                ),
+                dict(args=[{"visible": [False, True]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Slots by Reorging Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "slots",
+                           }],
+                    label="Absolute",
+                    method="update"
+                )
+            ],
+            showactive=True,
+            active=0,
+            x=1.0,
+            xanchor='right',
+            y=1.15,
+            yanchor='top'
+        )]
+    )
+
+def create_reorger_validator(df_90, df_60, df_30, df_14, df_7, order, df):
+    return leaderboard_figure(leaderboard(df, "validator", order, 12), "validator", create_reorger_validator_layout())
+
+
+
+
+
+
+def create_reorger_relay_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 20
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+        xaxis_title='%',
+        yaxis_title='Relay',
+        margin=dict(l=20, r=20, t=80, b=20),
+        font=dict(family="Ubuntu Mono", size=font_size),
+        hovermode = "closest",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        paper_bgcolor= "#eee",
+        updatemenus=[dict(
+            type="buttons",
+            buttons=[
+                dict(args=[{"visible": [True, False]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Nr. of Slots by Reorging Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "%",
+                           }],
+                    label="Relative",
+                    method="update"
+                ),
+                dict(args=[{"visible": [False, True]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Slots by Reorging Relay<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "slots",
+                           }],
+                    label="Absolute",
+                    method="update"
+                )
+            ],
+            showactive=True,
+            direction='left',
+            active=0,
+            x=1.0,
+            xanchor='right',
+            y=1.15,
+            yanchor='top'
+        )]
+    )
+
+def create_reorger_relay(df_90, df_60, df_30, df_14, df_7, order, df):
+    return leaderboard_figure(leaderboard(df, "relay", order, 11), "relay", create_reorger_relay_layout())
+
+
+def fig6_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 20
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+        xaxis_title='%',
+        yaxis_title='Builder',
+        margin=dict(l=20, r=20, t=80, b=20),
+        font=dict(family="Ubuntu Mono", size=font_size),
+        hovermode = "closest",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        updatemenus=[dict(
+            type="buttons",
+            buttons=[
+                dict(args=[{"visible": [True, False]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "%",
+                           }],
+                    label="Relative",
+                    method="update"
+                ),
+                dict(args=[{"visible": [False, True]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per Builder<br><span style="font-size:{font_size-3}px;">(last 60 days)</span></span>',
+                            "xaxis.title": "slots",
+                           }],
+                    label="Absolute",
+                    method="update"
+                )
+            ],
+            showactive=True,
+            direction='left',
+            active=0,
+            x=1.0,
+            xanchor='right',
+            y=1.15,
+            yanchor='top'
+        )]
+    )
+
+
+def create_fig_for_builders(df_90, df, df_30, df_14, df_7, order):
+    return leaderboard_figure(leaderboard(df, "builder", order, 12), "builder", fig6_layout())
+
+def fig7_layout(width=801):
+    if width <= 800:
+        font_size = 10
+    else:
+        font_size = 20
+    return dict(
+        title=f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per CL Client<br><span style="font-size:{font_size-3}px;">(last 30 days)</span></span>',
+        xaxis_title='Date',
+        yaxis_title='Slots',
+        margin=dict(l=20, r=20, t=80, b=20),
+        font=dict(family="Ubuntu Mono", size=font_size),
+        hovermode = "x unified",
+        hoverlabel=dict(
+            font_size=font_size,
+            font_family="Ubuntu Mono"
+        ),
+        barmode='stack',
+        xaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff"   ,     
+            gridwidth=1.5   ,     
+        ),
+        yaxis=dict(
+            fixedrange=True, 
+            showgrid=True,
+            gridcolor="#ffffff",
+            gridwidth=1.5,
+        ),
+        legend=dict(
+            x=1,           # x position of the legend (1 corresponds to the right end of the plot)
+            y=1,           # y position of the legend (1 corresponds to the top of the plot)
+            xanchor="auto",  # x anchor of the legend
+            yanchor="auto",  # y anchor of the legend
+            bgcolor="rgba(255, 255, 255, 0.5)" # You can set a background color for readability if needed
+        ),
+        updatemenus=[dict(
+            type="buttons",
+            buttons=[
+                dict(args=[{"visible": [True if i %2==0 else False for i in range(10)]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Relative Share of Reorged Slots per CL Client<br><span style="font-size:{font_size-3}px;">(last 30 days)</span></span>',
+                            "xaxis.title": "%",
+                           }],
+                    label="Relative",
+                    method="update"
+                ),
+                dict(args=[{"visible": [False if i %2==0 else True for i in range(10)]},
+                           {"title": f'<span style="font-size: {font_size}px;font-weight:bold;">Absolute Nr. of Reorged Slots per CL Client<br><span style="font-size:{font_size-3}px;">(last 30 days)</span></span>',
+                            "xaxis.title": "slots",
+                           }],
+                    label="Absolute",
+                    method="update"
+                )
+            ],
+            showactive=True,
+            direction='left',
+            active=1,
+            x=1.0,
+            xanchor='right',
+            y=1.15,
+            yanchor='top'
+        )]
+    )
+
+def create_fig_stacked(daily, order):
+    _df = daily_client_counts(daily, 30)
+    _df = _df[~_df['cl_client'].str.contains('Unknown')]
+    _df = pd.merge(_df,order,how="left", left_on="cl_client", right_on="cl_client")
+    _df["cl_client"]= _df["cl_client"].apply(lambda x: x[0].upper()+x[1:])
+    _df.columns = ['date', 'cl_client', 'slot', 'slots']
+    _df["relative_count"] = round(_df['slot'] / _df['slots'] * 100, 5)
+    _df.sort_values("relative_count", ascending=False, inplace=True)
+    _df = orderclclient(_df)
+
+    fig = make_subplots(rows=1, cols=1)
+
+    # Colors array (can be extended with more colors)
+    colors = [
+        '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+        '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
+    ]
+
+    # Add traces for each client
+    for i, client in enumerate(_df["cl_client"].unique()):
+        df = _df[_df["cl_client"] == client]
+        fig.add_trace(
+            go.Bar(
+                x=df["date"], 
+                y=df["relative_count"], 
+                name=client, 
+                marker_color=colors[i], 
+                visible=False, 
+                hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>'
+             )
+        )
+        fig.add_trace(
+            go.Bar(x=df["date"], y=df["slot"], 
+                   name=client, marker_color=colors[i],hovertemplate=f'<b>{client}: ' +  '%{y}</b><extra></extra>'
+                  )
+        )
+        
+    fig.update_layout(**fig7_layout())
+    
+    fig.update_yaxes(title_standoff=5)
+    return fig
+
+
+
+# Figures
+def create_figures(df_90, df_60, df_30, df_14, df_7, sie_counts, df2, df3, df4, df5, dfreorger, daily):
+    fig1 = create_fig1(daily)
+    fig2 = create_fig2(df_90, df_60, df_30, df_14, df_7, df5)
+    fig3 = create_fig3(sie_counts)
+    fig4 = create_fig_for_validators(df_90, df_60, df_30, df_14, df_7, df2)
+    fig5 = create_fig_for_relays(df_90, df_60, df_30, df_14, df_7, df3)
+    fig6 = create_fig_for_builders(df_90, df_60, df_30, df_14, df_7, df4)
+    fig7 = create_fig_stacked(daily, df5)
+    fig8 = create_reorger_relay(df_90, df_60, df_30, df_14, df_7, df3, dfreorger)
+    fig9 = create_reorger_validator(df_90, df_60, df_30, df_14, df_7, df2, dfreorger)
+    fig10 = create_reorger_builder(df_90, df_60, df_30, df_14, df_7, df4, dfreorger)
+    return fig1, fig2, fig3, fig4, fig5, fig6, fig7, fig8, fig9, fig10
+
+
+# Layout functions per graph; they only switch on width <= 800
+LAYOUT_FUNCTIONS = {
+    1: fig1_layout,
+    2: fig2_layout,
+    3: fig3_layout,
+    4: fig4_layout,
+    5: fig5_layout,
+    6: fig6_layout,
+    7: fig7_layout,
+    8: create_reorger_relay_layout,
+    9: create_reorger_validator_layout,
+    10: create_reorger_builder_layout,
+}
+BUCKET_WIDTHS = {"narrow": 800, "wide": 801}
+
+def flatten_layout(layout, prefix=""):
+    # Flatten into Plotly.relayout attribute strings, e.g. "updatemenus[0].buttons[1].args";
+    # button args are method arguments, not layout, so they are replaced as a whole
+    flat = {}
+    for key, value in layout.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten_layout(value, path))
+        elif key != "args" and isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            for i, v in enumerate(value):
+                flat.update(flatten_layout(v, f"{path}[{i}]"))
+        else:
+            flat[path] = value
+    return flat
+
+def build_layout_deltas():
+    # Only the attributes that differ between the width buckets are shipped to the browser
+    deltas = {}
+    for i, layout_function in LAYOUT_FUNCTIONS.items():
+        flat = {
+            bucket: flatten_layout(go.Layout(**layout_function(width)).to_plotly_json())
+            for bucket, width in BUCKET_WIDTHS.items()
+        }
+        changed = [k for k in flat["wide"] if flat["wide"][k] != flat["narrow"].get(k)]
+        deltas[f"graph{i}"] = {bucket: {k: flat[bucket][k] for k in changed} for bucket in BUCKET_WIDTHS}
+    return deltas
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# Response compression and ETag revalidation for the Dash server
+#
+# JSON, HTML, CSS and JS responses are compressed with Brotli when the
+# client accepts it and the brotli package is installed, otherwise gzip.
+# The page, layout and dependency GETs carry a strong ETag of their
+# uncompressed body (per encoding), so repeat visitors get a 304. The
+# /_dash-layout body only changes with the data snapshot, so it is cached per
+# snapshot generation and encoding and served, or answered with a 304, before
+# Dash rebuilds it. Fingerprinted assets keep Dash's long max-age; their
+# compressed body is cached per path and encoding so it is compressed once.
+
+import gzip
+import hashlib
+import threading
+import flask
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = 500
+COMPRESS_TYPES = ("application/json", "text/html", "text/css", "text/plain", "application/javascript", "text/javascript")
+LAYOUT_PATH = "/_dash-layout"
+# Responses revalidated with an ETag on every use; everything else keeps its own caching headers
+REVALIDATE_PATHS = ("/", LAYOUT_PATH, "/_dash-dependencies")
+
+# (generation, encoding) -> (etag, body) of the layout response
+_layouts = {}
+# (path, encoding) -> compressed body of a long-lived asset
+_assets = {}
+_lock = threading.Lock()
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick br or gzip from an Accept-Encoding header, or None"""
+    if brotli is not None and accept_encoding["br"]:
+        return "br"
+    if accept_encoding["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress(body, encoding):
+    """Compress a response body with the negotiated encoding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def body_etag(body, encoding):
+    """Strong ETag of an uncompressed body, distinct per content encoding"""
+    return f"{hashlib.sha256(body).hexdigest()[:32]}-{encoding or 'identity'}"
+
+
+def _finish(response, etag, encoding):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_http_caching(server, generation):
+    """Compress and revalidate responses; generation() returns the snapshot generation"""
+
+    @server.before_request
+    def _cached_layout():
+        if flask.request.path != LAYOUT_PATH or flask.request.method != "GET":
+            return None
+        encoding = negotiate_encoding(flask.request.accept_encodings)
+        flask.g.layout_generation = generation()
+        with _lock:
+            cached = _layouts.get((flask.g.layout_generation, encoding))
+        if cached is None:
+            return None
+        etag, body = cached
+        flask.g.layout_cached = True
+        if flask.request.if_none_match.contains(etag):
+            return _finish(flask.Response(status=304), etag, None)
+        return _finish(flask.Response(body, mimetype="application/json"), etag, encoding)
+
+    @server.after_request
+    def _compress_and_tag(response):
+        request = flask.request
+        if flask.g.get("layout_cached") or response.direct_passthrough or response.status_code != 200 or "Content-Encoding" in response.headers:
+            return response
+        if response.mimetype not in COMPRESS_TYPES:
+            return response
+        body = response.get_data()
+        encoding = negotiate_encoding(request.accept_encodings) if len(body) >= COMPRESS_MIN_BYTES else None
+        if request.method != "GET" or request.path not in REVALIDATE_PATHS:
+            if encoding:
+                long_lived = request.method == "GET" and response.cache_control.max_age
+                with _lock:
+                    compressed = _assets.get((request.path, encoding)) if long_lived else None
+                if compressed is None:
+                    compressed = compress(body, encoding)
+                    if long_lived:
+                        with _lock:
+                            _assets[(request.path, encoding)] = compressed
+                response.set_data(compressed)
+                response.headers["Content-Encoding"] = encoding
+                response.vary.add("Accept-Encoding")
+            return response
+        etag = body_etag(body, encoding)
+        if request.if_none_match.contains(etag):
+            return _finish(flask.Response(status=304), etag, None)
+        if encoding:
+            body = compress(body, encoding)
+            response.set_data(body)
+        # Cache the layout unless a reload swapped the snapshot while it was built
+        current = generation()
+        if request.path == LAYOUT_PATH and flask.g.get("layout_generation") == current:
+            with _lock:
+                for key in [key for key in _layouts if key[0] != current]:
+                    del _layouts[key]
+                _layouts[(current, encoding)] = (etag, body)
+        return _finish(response, etag, encoding)
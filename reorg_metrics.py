@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# Prometheus-style metrics for the Dash server
+#
+# Request latency and response size histograms are recorded per route, and
+# per callback output for _dash-update-component. The /_dash-layout route
+# builds the page and serializes every figure, so its latency is the figure
+# serialization time. Metrics are kept per process; every gunicorn worker
+# reports its own series, labelled with its pid. METRICS_PATH is for a local
+# scraper and answers 404 to any client that does not connect over loopback.
+
+import os
+import time
+import ipaddress
+import threading
+import flask
+from run_report import current_rss
+
+METRICS_PATH = os.environ.get("METRICS_PATH", "/metrics")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7)
+HELP = {
+    "reorg_request_seconds": ("histogram", "Request latency by route and callback output"),
+    "reorg_response_bytes": ("histogram", "Response body size by route and callback output"),
+    "reorg_figure_serialize_seconds": ("histogram", "Time to build and serialize the page layout with all figures"),
+    "reorg_process_rss_bytes": ("gauge", "Resident set size of the worker process"),
+    "reorg_snapshot_generation": ("gauge", "Dashboard snapshot generation served by the worker"),
+}
+
+# (metric, labels) -> [bucket counts..., +Inf count, sum]
+_histograms = {}
+_lock = threading.Lock()
+
+
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    """Add one observation to a histogram series"""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                series[i] += 1
+        series[len(buckets)] += 1
+        series[-1] += value
+
+
+def _labels(pairs):
+    return ",".join(f'{key}="{value}"' for key, value in pairs)
+
+
+def render(generation=None):
+    """Prometheus text exposition of every series plus the process gauges"""
+    pid = str(os.getpid())
+    lines = []
+    with _lock:
+        histograms = {key: list(series) for key, series in _histograms.items()}
+    for name in ("reorg_request_seconds", "reorg_response_bytes", "reorg_figure_serialize_seconds"):
+        kind, text = HELP[name]
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+        buckets = BYTES_BUCKETS if name == "reorg_response_bytes" else LATENCY_BUCKETS
+        for (metric, pairs), series in sorted(histograms.items()):
+            if metric != name:
+                continue
+            pairs = pairs + (("pid", pid),)
+            for bound, count in zip(buckets, series):
+                lines.append(f'{name}_bucket{{{_labels(pairs + (("le", f"{bound:g}"),))}}} {count}')
+            lines.append(f'{name}_bucket{{{_labels(pairs + (("le", "+Inf"),))}}} {series[len(buckets)]}')
+            lines.append(f"{name}_sum{{{_labels(pairs)}}} {series[-1]:.6f}")
+            lines.append(f"{name}_count{{{_labels(pairs)}}} {series[len(buckets)]}")
+    gauges = {"reorg_process_rss_bytes": current_rss()}
+    if generation is not None:
+        gauges["reorg_snapshot_generation"] = generation
+    for name, value in gauges.items():
+        kind, text = HELP[name]
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}", f'{name}{{pid="{pid}"}} {value}']
+    return "\n".join(lines) + "\n"
+
+
+def is_loopback(address):
+    """Whether a client address is a loopback address"""
+    try:
+        return ipaddress.ip_address(address).is_loopback
+    except ValueError:
+        return False
+
+
+def _callback_label():
+    """Output id of the callback a _dash-update-component request is for"""
+    body = flask.request.get_json(silent=True) or {}
+    return str(body.get("output", "unknown")).replace('"', "'")
+
+
+def init_metrics(server, generation=lambda: None):
+    """Record request metrics on a Flask server and serve them at METRICS_PATH"""
+
+    @server.before_request
+    def _start_timer():
+        flask.g.metrics_start = time.perf_counter()
+
+    @server.after_request
+    def _record(response):
+        start = flask.g.pop("metrics_start", None)
+        path = flask.request.path
+        if start is None or path == METRICS_PATH:
+            return response
+        seconds = time.perf_counter() - start
+        route = path.split("/")[1] if path.startswith("/_dash-") else "index" if path == "/" else "other"
+        callback = _callback_label() if route == "_dash-update-component" else ""
+        observe("reorg_request_seconds", seconds, route=route, callback=callback)
+        if not response.direct_passthrough:
+            observe("reorg_response_bytes", response.calculate_content_length() or 0, BYTES_BUCKETS, route=route, callback=callback)
+        # Cached layouts and 304s build no figures, so they are not serialization time
+        if route == "_dash-layout" and not flask.g.get("layout_cached"):
+            observe("reorg_figure_serialize_seconds", seconds)
+        return response
+
+    @server.route(METRICS_PATH)
+    def _metrics():
+        if not is_loopback(flask.request.remote_addr or ""):
+            flask.abort(404)
+        return flask.Response(render(generation()), mimetype="text/plain; version=0.0.4")
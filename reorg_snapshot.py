@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# Prebuilt dashboard snapshot: figure JSON, layout deltas and table columns
+#
+# The ETL writes the snapshot once after refreshing the slot store, so a
+# gunicorn worker does not rerun the pandas aggregations and Plotly
+# construction for every figure. The snapshot is an uncompressed Arrow IPC
+# file holding one record batch with a single row: one binary cell per
+# figure and for the layout deltas, one list cell per table column and per
+# precomputed ascending and descending sort order. Workers memory-map it read-only, so the figures and
+# the table stay in the shared page cache instead of every worker's heap;
+# figure JSON is only parsed while a page layout is built. Running workers
+# poll the snapshot file, which the ETL replaces atomically after every other
+# output, and hot-swap the new one; only a worker starting on a missing or
+# stale snapshot builds one in-process.
+
+import os
+import json
+import time
+import hashlib
+import threading
+import pyarrow as pa
+from datetime import datetime
+from reorg_store import REORG_STORE, REORGERS_STORE, DAILY_STORE, EPOCH_ROLLUP_STORE
+
+SNAPSHOT_FILE = "dashboard-snapshot.arrow"
+# Bump when the snapshot layout changes so stale files are rebuilt
+SNAPSHOT_VERSION = 4
+SOURCE_FILES = [REORG_STORE, REORGERS_STORE, DAILY_STORE, EPOCH_ROLLUP_STORE, "validator_slots.csv", "relay_slots.csv", "builder_slots.csv", "clclient_slots.csv"]
+# Modules that build the snapshot; a deploy changing them makes the committed snapshot stale
+CODE_FILES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name) for name in ("reorg_figures.py", "reorg_store.py", "reorg_table.py")]
+# Seconds between data file polls in each app worker; 0 disables hot reload
+RELOAD_INTERVAL = int(os.environ.get("SNAPSHOT_RELOAD_INTERVAL", 30))
+
+# (generation, snapshot) served right now; replaced as a whole, never mutated
+_live = (0, None)
+_watcher_pid = None
+_watcher_lock = threading.Lock()
+
+
+def source_version(paths=SOURCE_FILES + CODE_FILES):
+    """Content hash of the input files and code a snapshot is built from; a missing file hashes as its name"""
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(path.encode())
+    return digest.hexdigest()[:16]
+
+
+def _cell(values):
+    """One list cell holding all of `values`"""
+    return pa.ListArray.from_arrays(pa.array([0, len(values)], pa.int32()), pa.array(values))
+
+
+def build_snapshot():
+    """Prepare the data and build every figure once, as a one-row record batch"""
+    from reorg_figures import prepare_data, create_figures, build_layout_deltas
+    from reorg_table import column_orders
+
+    df_90, df_60, df_30, df_14, df_7, df_table, sie_counts, df2, df3, df4, df5, dfreorger, daily = prepare_data()
+    figures = create_figures(df_90, df_60, df_30, df_14, df_7, sie_counts, df2, df3, df4, df5, dfreorger, daily)
+    cells = {f"graph{i}": pa.array([fig.to_json().encode()]) for i, fig in enumerate(figures, start=1)}
+    cells["layout_deltas"] = pa.array([json.dumps(build_layout_deltas()).encode()])
+    cells.update({f"table:{column}": _cell(df_table[column]) for column in df_table.columns})
+    cells.update({f"{direction}:{column}": _cell(order) for direction, orders in column_orders(df_table).items() for column, order in orders.items()})
+    metadata = {
+        "version": str(SNAPSHOT_VERSION),
+        "source": source_version(),
+        "built": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    return pa.RecordBatch.from_arrays(list(cells.values()), names=list(cells), metadata=metadata)
+
+
+def write_snapshot(batch, path=SNAPSHOT_FILE):
+    """Write the snapshot atomically so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    os.replace(tmp_path, path)
+    print(f"Dashboard snapshot written: {path}")
+
+
+def snapshot_view(batch):
+    """Snapshot dict over a record batch; figures and table columns stay zero-copy Arrow data"""
+    metadata = batch.schema.metadata
+    cells = {name: column[0] for name, column in zip(batch.schema.names, batch.columns)}
+    columns = [name.split(":", 1)[1] for name in cells if name.startswith("table:")]
+    return {
+        "version": int(metadata[b"version"]),
+        "source": metadata[b"source"].decode(),
+        "built": metadata[b"built"].decode(),
+        "figures": {name: cell.as_buffer() for name, cell in cells.items() if name.startswith("graph")},
+        "layout_deltas": json.loads(cells["layout_deltas"].as_py()),
+        "table": {
+            "columns": columns,
+            "rows": len(cells[f"table:{columns[0]}"].values) if columns else 0,
+            "data": {column: cells[f"table:{column}"].values for column in columns},
+            "orders": {direction: {column: cells[f"{direction}:{column}"].values.to_numpy() for column in columns} for direction in ("asc", "desc")},
+        },
+    }
+
+
+def snapshot_figures(snapshot):
+    """Parse the figure JSON of a snapshot; called per layout build, not kept per worker"""
+    return {name: json.loads(buffer.to_pybytes()) for name, buffer in snapshot["figures"].items()}
+
+
+def read_snapshot(path=SNAPSHOT_FILE):
+    """Map a prebuilt snapshot read-only; raises ValueError for another snapshot layout version"""
+    # The map stays open while any array of the batch is referenced
+    batch = pa.ipc.open_file(pa.memory_map(path, "r")).get_batch(0)
+    if int(batch.schema.metadata[b"version"]) != SNAPSHOT_VERSION:
+        raise ValueError(f"snapshot version {batch.schema.metadata[b'version'].decode()}, expected {SNAPSHOT_VERSION}")
+    return snapshot_view(batch)
+
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """Map the prebuilt snapshot read-only, rebuilding in-process when it is missing or stale"""
+    try:
+        snapshot = read_snapshot(path)
+        if snapshot["source"] == source_version():
+            return snapshot
+    except (OSError, ValueError, KeyError, TypeError, pa.ArrowInvalid):
+        pass
+    return snapshot_view(build_snapshot())
+
+
+def file_signature(paths):
+    """mtime and size of each watched file, None for files that do not exist"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def _watch(path, interval, seen):
+    """Poll the snapshot file and swap in the one the ETL wrote
+
+    The data files are not watched: the ETL writes them over several
+    minutes, and a worker rebuilding from them would serve a mix of old and
+    new inputs in its own heap. The snapshot is written last and atomically.
+    """
+    global _live
+    while True:
+        time.sleep(interval)
+        signature = file_signature([path])
+        if signature == seen:
+            continue
+        try:
+            snapshot = read_snapshot(path)
+        except Exception as e:
+            print(f"Dashboard snapshot reload failed, keeping generation {_live[0]}: {e}")
+        else:
+            _live = (_live[0] + 1, snapshot)
+            print(f"Dashboard snapshot reloaded: generation {_live[0]}")
+        seen = signature
+
+
+def live_snapshot(path=SNAPSHOT_FILE, interval=RELOAD_INTERVAL):
+    """Return the (generation, snapshot) pair currently being served
+
+    The first call in a process loads the snapshot and starts the watcher
+    thread; it is checked per pid so workers forked after a preload get their own.
+    """
+    global _live, _watcher_pid
+    if _watcher_pid == os.getpid():
+        return _live
+    with _watcher_lock:
+        if _watcher_pid != os.getpid():
+            signature = file_signature([path])
+            if _live[1] is None:
+                _live = (1, load_snapshot(path))
+            if interval > 0:
+                threading.Thread(target=_watch, args=(path, interval, signature), name="snapshot-watcher", daemon=True).start()
+            _watcher_pid = os.getpid()
+    return _live
+
+
+if __name__ == "__main__":
+    write_snapshot(build_snapshot())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# Columnar slot store shared by the ETL scripts and the Dash app
+#
+# The store keeps one typed row per reorged slot: integer slot/parent slot,
+# a real timestamp and categorical client/validator/builder/relay columns.
+# Markdown links and parent-slot labels are only built at render time.
+
+import os
+import sys
+import json
+import time
+import numpy as np
+import pandas as pd
+
+GENESIS_TIME = 1606824023
+SECONDS_PER_SLOT = 12
+SLOTS_PER_EPOCH = 32
+SLOTS_PER_DAY = 7200
+
+REORG_STORE = "reorg-data.parquet"
+REORGERS_STORE = "reorgers-data.parquet"
+PYXATU_STORE = "reorg-depths.parquet"
+DAILY_STORE = "reorg-daily.parquet"
+EPOCH_ROLLUP_STORE = "reorg-slot-in-epoch-daily.parquet"
+PYXATU_DAILY_STORE = "reorg-depths-daily.parquet"
+WATERMARK_FILE = "etl-watermark.json"
+
+WINDOW_DAYS = (90, 60, 30, 14, 7)
+
+CATEGORY_COLUMNS = ["cl_client", "validator", "builder", "relay"]
+INTEGER_COLUMNS = ["slot", "parent_slot", "validator_id", "depth", "reorg_slot", "epoch"]
+# Daily rollup cube: one row per day and dimension values, additive measures
+ROLLUP_DIMENSIONS = ["cl_client", "builder", "relay"]
+EPOCH_ROLLUP_DIMENSIONS = ["cl_client", "slot_in_epoch"]
+ROLLUP_MEASURES = ["reorgs", "slots"]
+# Retention tiers: raw slot rows are kept by the ETL's RETENTION_DAYS, rollups
+# keep daily rows for this many days and fold older ones into weekly rows
+ROLLUP_DAILY_DAYS = int(os.environ.get("ROLLUP_DAILY_DAYS", 400))
+
+
+def slot_to_datetime(slots):
+    """Convert a series of slot numbers to naive UTC timestamps"""
+    return pd.to_datetime(GENESIS_TIME + slots.astype("int64") * SECONDS_PER_SLOT, unit="s")
+
+
+class _PrintableAscii(dict):
+    """str.translate table that drops code points outside 0x20-0x7E, filled in lazily"""
+
+    def __missing__(self, code):
+        value = code if 0x20 <= code <= 0x7E else None
+        self[code] = value
+        return value
+
+
+PRINTABLE_ASCII = _PrintableAscii()
+
+
+def clean_text(values):
+    """Strip non-printable characters, translating each distinct value only once"""
+    uniques = values.dropna().unique()
+    return values.map({u: u.translate(PRINTABLE_ASCII) if isinstance(u, str) else u for u in uniques})
+
+
+def current_slot():
+    """Approximate head slot from the wall clock"""
+    return int((time.time() - GENESIS_TIME) // SECONDS_PER_SLOT)
+
+
+def to_store_frame(df):
+    """Cast an ETL result frame to the typed store schema"""
+    df = df.copy()
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna(0).astype("int64")
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category").cat.remove_unused_categories()
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"])
+    else:
+        df["date"] = slot_to_datetime(df["slot"])
+    df["slot_in_epoch"] = (df["slot"] % SLOTS_PER_EPOCH).astype("int8")
+    return df.sort_values("slot", kind="stable").reset_index(drop=True)
+
+
+def write_store(df, path):
+    """Write a frame to a Parquet slot store and return the typed frame"""
+    df = to_store_frame(df)
+    df.to_parquet(path, index=False)
+    return df
+
+
+def read_store(path, columns=None):
+    """Load a Parquet slot store, categoricals and timestamps included"""
+    return pd.read_parquet(path, columns=columns)
+
+
+def read_recent(path, days):
+    """Load the rows within `days` days of a slot store's last slot; older row groups are not decoded"""
+    head = pd.read_parquet(path, columns=["slot"])["slot"].max()
+    if pd.isna(head):
+        return read_store(path)
+    return pd.read_parquet(path, filters=[("slot", ">", int(head) - days * SLOTS_PER_DAY)])
+
+
+def read_watermark(path=WATERMARK_FILE):
+    """Last slot the incremental ETL has processed, or None before the first run"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["slot"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_watermark(slot, path=WATERMARK_FILE):
+    """Persist the last processed slot once every store has been merged"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"slot": int(slot)}, f)
+    os.replace(tmp_path, path)
+
+
+def merge_increment(path, new, start_slot, retention_days):
+    """Replace rows after start_slot with a freshly fetched increment and expire old rows"""
+    if os.path.exists(path):
+        old = read_store(path)
+        new = pd.concat([old[old["slot"] <= start_slot], new], ignore_index=True)
+    if len(new):
+        new = new[new["slot"] > new["slot"].max() - retention_days * SLOTS_PER_DAY]
+    return write_store(new, path)
+
+
+def window_starts(slots, days=WINDOW_DAYS):
+    """Binary-search the first row of each trailing window in a sorted slot array"""
+    if len(slots) == 0:
+        return {d: 0 for d in days}
+    head = slots[-1]
+    cutoffs = head - np.asarray(days, dtype="int64") * SLOTS_PER_DAY
+    starts = np.searchsorted(slots, cutoffs, side="right")
+    return dict(zip(days, starts.tolist()))
+
+
+def slot_in_epoch_counts(df, clients, days=WINDOW_DAYS):
+    """Rows per trailing window, client and slot in epoch as a days x clients x 32 int array
+
+    The windows are nested, so every row is binned once into the narrowest
+    window holding it and the wider windows are cumulative sums of those bins.
+    Rows of clients not listed are skipped.
+    """
+    if not df["slot"].is_monotonic_increasing:
+        df = df.sort_values("slot", kind="stable")
+    starts = window_starts(df["slot"].to_numpy(), days)
+    wide_first = sorted(days, reverse=True)
+    # Bin i holds the rows of window wide_first[i] that are in no narrower window; -1 is outside all
+    bins = np.searchsorted([starts[d] for d in wide_first], np.arange(len(df)), side="right") - 1
+    client = pd.Categorical(df["cl_client"], categories=list(clients)).codes
+    keep = (bins >= 0) & (client >= 0)
+    keys = (bins[keep] * len(clients) + client[keep]) * SLOTS_PER_EPOCH + df["slot_in_epoch"].to_numpy()[keep]
+    counts = np.bincount(keys, minlength=len(days) * len(clients) * SLOTS_PER_EPOCH)
+    counts = counts.reshape(len(days), len(clients), SLOTS_PER_EPOCH)[::-1].cumsum(axis=0)[::-1]
+    return counts[[wide_first.index(d) for d in days]]
+
+
+def window_slices(df, days=WINDOW_DAYS):
+    """Split a store frame into trailing day windows, each a positional slice of one sorted frame"""
+    if not df["slot"].is_monotonic_increasing:
+        df = df.sort_values("slot", kind="stable")
+    starts = window_starts(df["slot"].to_numpy(), days)
+    return {d: df.iloc[start:] for d, start in starts.items()}
+
+
+def daily_rollup(df, dimensions=ROLLUP_DIMENSIONS, measure="reorgs"):
+    """Count slots per UTC day and dimension values; a slot with several relays counts once, under the lowest"""
+    rows = pd.DataFrame({"slot": df["slot"].to_numpy(), "day": df["date"].dt.normalize().to_numpy()})
+    for column in dimensions:
+        values = df[column]
+        rows[column] = values.to_numpy() if pd.api.types.is_integer_dtype(values) else values.astype(object).fillna("Unknown").to_numpy()
+    if "relay" in dimensions:
+        rows = rows.sort_values("relay", kind="stable")
+    rows = rows.drop_duplicates([column for column in rows.columns if column != "relay"])
+    return rows.groupby(["day", *dimensions]).size().rename(measure).reset_index()
+
+
+def to_rollup_frame(df):
+    """Cast a daily rollup to its stored schema: categorical dimensions, integer measures"""
+    df = df.copy()
+    for column in df.columns:
+        if column in ROLLUP_MEASURES:
+            df[column] = df[column].fillna(0).astype("int64")
+        elif column == "slot_in_epoch":
+            df[column] = df[column].astype("int8")
+        elif column != "day":
+            df[column] = df[column].astype("category").cat.remove_unused_categories()
+    return df.sort_values("day", kind="stable").reset_index(drop=True)
+
+
+def compact_rollup(cube, daily_days=ROLLUP_DAILY_DAYS):
+    """Fold the rows more than daily_days before the last day into weekly rows dated on their Monday"""
+    if cube.empty:
+        return cube
+    cutoff = cube["day"].max() - pd.Timedelta(days=daily_days)
+    cutoff -= pd.Timedelta(days=cutoff.weekday())
+    old = cube["day"] < cutoff
+    if not old.any():
+        return cube
+    weeks = cube[old].assign(day=cube.loc[old, "day"] - pd.to_timedelta(cube.loc[old, "day"].dt.weekday, unit="D"))
+    dimensions = [column for column in cube.columns if column != "day" and column not in ROLLUP_MEASURES]
+    measures = [column for column in cube.columns if column in ROLLUP_MEASURES]
+    weeks = weeks.groupby(["day", *dimensions], observed=True, as_index=False)[measures].sum()
+    return to_rollup_frame(pd.concat([weeks, cube[~old]], ignore_index=True))
+
+
+def merge_rollup(path, new, start_day, daily_days=ROLLUP_DAILY_DAYS):
+    """Replace the days from start_day on in a rollup store, compact old days and return the typed cube"""
+    start_day = pd.Timestamp(start_day)
+    new = new[new["day"] >= start_day]
+    if os.path.exists(path):
+        old = pd.read_parquet(path)
+        new = pd.concat([old[old["day"] < start_day], new], ignore_index=True)
+    new = compact_rollup(to_rollup_frame(new), daily_days)
+    new.to_parquet(path, index=False)
+    return new
+
+
+def read_rollup(path=DAILY_STORE, dimensions=ROLLUP_DIMENSIONS, store=REORG_STORE):
+    """Load a rollup store, or roll up the slot store (reorgs only) before the ETL has written one"""
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    return to_rollup_frame(daily_rollup(read_store(store), dimensions))
+
+
+def rollup_window(cube, days):
+    """Trailing window of a rollup on its last `days` whole days; None is all of it"""
+    if cube.empty or days is None:
+        return cube
+    return cube[cube["day"] > cube["day"].max() - pd.Timedelta(days=days)]
+
+
+def rollup_slot_in_epoch_counts(cube, clients, days):
+    """Reorgs per window, client and slot in epoch from a slot-in-epoch rollup, like slot_in_epoch_counts"""
+    counts = np.zeros((len(days), len(clients), SLOTS_PER_EPOCH), dtype="int64")
+    for w, d in enumerate(days):
+        window = rollup_window(cube, d)
+        client = pd.Categorical(window["cl_client"], categories=list(clients)).codes.astype("int64")
+        keep = client >= 0
+        keys = client[keep] * SLOTS_PER_EPOCH + window["slot_in_epoch"].to_numpy()[keep]
+        counts[w] = np.bincount(keys, weights=window["reorgs"].to_numpy()[keep], minlength=len(clients) * SLOTS_PER_EPOCH).reshape(len(clients), SLOTS_PER_EPOCH)
+    return counts
+
+
+def slot_links(slots):
+    """Render slot numbers as beaconcha.in markdown links"""
+    slots = slots.astype(str)
+    return "[" + slots + "](https://beaconcha.in/slot/" + slots + ")"
+
+
+def parent_slot_labels(parent_slots, slots):
+    """Render parent slots as `parent (distance)`, or 0 when unknown"""
+    labels = parent_slots.astype(str) + " (" + (parent_slots - slots).astype(str) + ")"
+    return labels.where(parent_slots != 0, "0")
+
+
+def legacy_csv_to_store(path):
+    """Parse a legacy CSV with markdown-link slots into the store schema"""
+    df = pd.read_csv(path)
+    df["slot"] = df["slot"].str.extract(r"\[(\d+)\]", expand=False).astype("int64")
+    if "parent_slot" in df.columns:
+        df["parent_slot"] = df["parent_slot"].astype(str).str.split(" ", n=1).str[0].astype("int64")
+    return to_store_frame(df)
+
+
+if __name__ == "__main__":
+    # Usage: python reorg_store.py reorg-data.csv reorg-data.parquet
+    legacy_csv_to_store(sys.argv[1]).to_parquet(sys.argv[2], index=False)
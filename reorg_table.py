@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# Server-side paging and sorting for the reorg table
+#
+# The snapshot keeps the table columns in date order as memory-mapped Arrow
+# arrays. For every column a stable ascending and a stable descending argsort
+# are computed once when the snapshot is built and stored with it; a page
+# request then only slices one of them and converts the page's rows, so no
+# request sorts or copies the full table. Both keep the newest-first order
+# among equal values.
+
+import numpy as np
+import pyarrow as pa
+
+# Columns rendered as text whose order follows the slot number inside them
+SORT_KEYS = {
+    "Slot": lambda values: values.str.extract(r"\[(\d+)\]", expand=False).astype("int64"),
+    "Parent Slot": lambda values: values.str.split(" ", n=1).str[0].astype("int64"),
+}
+
+
+def column_orders(df):
+    """Stable ascending and descending row orders of every table column, as {"asc": {...}, "desc": {...}}"""
+    orders = {"asc": {}, "desc": {}}
+    for column in df.columns:
+        values = df[column]
+        if column in SORT_KEYS:
+            values = SORT_KEYS[column](values)
+        ranks = values.rank(method="dense").to_numpy()
+        orders["asc"][column] = np.argsort(ranks, kind="stable").astype("int32")
+        orders["desc"][column] = np.argsort(-ranks, kind="stable").astype("int32")
+    return orders
+
+
+def page_count(table, page_size):
+    """Number of pages the table splits into"""
+    return max(1, -(-table["rows"] // page_size))
+
+
+def table_page(table, page_current, page_size, sort_by=None):
+    """Records of one table page, sorted by the first sort_by column if any"""
+    start = (page_current or 0) * page_size
+    if not sort_by:
+        columns = [table["data"][column].slice(start, page_size) for column in table["columns"]]
+    else:
+        column, direction = sort_by[0]["column_id"], sort_by[0]["direction"]
+        order = table["orders"][direction][column]
+        rows = pa.array(order[start:start + page_size])
+        columns = [table["data"][column].take(rows) for column in table["columns"]]
+    return pa.RecordBatch.from_arrays(columns, names=table["columns"]).to_pylist()
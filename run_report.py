@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# Per-stage timing and memory report for the data pipeline scripts
+#
+# Wrap a step in `with stage("name") as info:` and optionally set
+# info["rows"] / info["bytes"]. Stages with the same name (e.g. one per
+# fetched chunk, possibly on worker threads) are summed into one entry.
+# A stage's peak_rss is the process high-water mark while it ran: the mark is
+# reset when a stage starts (Linux clear_refs), so with stages running on
+# several threads at once it is the peak since the latest of them started.
+# write_report() dumps the run as JSON so runs can be diffed over time;
+# REORG_PROFILE=<file> additionally writes a cProfile dump that flameprof or
+# snakeviz can turn into a flamegraph.
+
+import os
+import json
+import time
+import resource
+import cProfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+_stages = {}
+_lock = threading.Lock()
+_started = time.perf_counter()
+_profiler = None
+# Highest mark seen before a reset, so the run's peak survives per-stage resets
+_run_peak = 0
+
+
+def current_rss():
+    """Resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        return peak_rss()
+
+
+def peak_rss():
+    """Resident set size high-water mark of this process in bytes, since the last reset"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def reset_peak_rss():
+    """Restart the high-water mark at the current RSS; False where the kernel does not support it"""
+    global _run_peak
+    _run_peak = max(_run_peak, peak_rss())
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage and record its memory, row count and payload size"""
+    info = {}
+    resettable = reset_peak_rss()
+    rss_before = current_rss()
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        seconds = time.perf_counter() - start
+        rss_after = current_rss()
+        with _lock:
+            entry = _stages.setdefault(name, {"calls": 0, "seconds": 0.0, "rows": 0, "bytes": 0, "rss_delta": 0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            entry["rows"] += int(info.get("rows", 0))
+            entry["bytes"] += int(info.get("bytes", 0))
+            entry["rss_delta"] += rss_after - rss_before
+            if resettable:
+                entry["peak_rss"] = max(entry.get("peak_rss", 0), peak_rss())
+
+
+def start_profile(path=os.environ.get("REORG_PROFILE")):
+    """Start cProfile for the run when a profile path is configured"""
+    global _profiler
+    if path:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def report(name):
+    """The run so far: total time, peak RSS and every stage in first-seen order"""
+    with _lock:
+        stages = {key: dict(value, seconds=round(value["seconds"], 4)) for key, value in _stages.items()}
+    return {
+        "run": name,
+        "finished": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+        "seconds": round(time.perf_counter() - _started, 4),
+        "peak_rss": max(_run_peak, peak_rss()),
+        "stages": stages,
+    }
+
+
+def write_report(name, path, profile_path=os.environ.get("REORG_PROFILE")):
+    """Write the JSON run report, plus the cProfile dump when profiling is on"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(name), f, indent=2)
+    print(f"Run report written: {path}")
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(profile_path)
+        print(f"Profile written: {profile_path}")